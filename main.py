@@ -6,6 +6,8 @@ import src.gui.utils.lang_loader
 import src.gui.utils.style_loader
 import src.gui.utils.keybindings_loader
 import src.gui.utils.project_loader
+import src.processing.convolution.pool
+import src.processing.convolution.arena
 import src.gui.state.app
 
 
@@ -21,11 +23,15 @@ def main():
     src.gui.utils.keybindings_loader.load()
     log.log.write(text=Info.PRELOADING_PROJECT.value, tag="INFO", modulename=Path(__file__).stem)
     src.gui.utils.project_loader.load()
+    log.log.write(text=Info.PRELOADING_WORKER_POOL.value, tag="INFO", modulename=Path(__file__).stem)
+    src.processing.convolution.pool.start()
     log.log.write(text=Info.BUILDING_MAIN.value, tag="INFO", modulename=Path(__file__).stem)
     src.gui.state.app.app.build()
     log.log.write(text=Info.INIT_DONE.value, tag="INFO", modulename=Path(__file__).stem)
     src.gui.state.app.app.mainloop()
     log.log.write(text=Info.CLOSE_WINDOW.value, tag="INFO", modulename=Path(__file__).stem)
+    src.processing.convolution.pool.shutdown()
+    src.processing.convolution.arena.shutdown()
 
 
 if __name__ == "__main__":
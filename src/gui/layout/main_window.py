@@ -290,7 +290,8 @@ class MainWindow(TkinterDnD.Tk):
         settings_look_keys: list[tuple[customtkinter.StringVar, Callable, list, str]] = [
             (root.current_lang.get("main_window_settings_look_lang_label"), self.settings_look_lang_output, [root.all_lang[key] for key in root.all_lang], root.all_lang[get_setting("lang")]),
             (root.current_lang.get("main_window_settings_look_darkmode_label"), self.settings_look_darkmode_output, ["system", "dark", "light"], get_setting("darkmode")),
-            (root.current_lang.get("main_window_settings_look_theme_label"), self.settings_look_theme_output, [key for key in root.all_styles], get_setting("color_theme"))
+            (root.current_lang.get("main_window_settings_look_theme_label"), self.settings_look_theme_output, [key for key in root.all_styles], get_setting("color_theme")),
+            (root.current_lang.get("main_window_settings_look_keep_intermediates_label"), self.settings_look_keep_intermediates_output, [root.current_lang.get("main_window_settings_on").get(), root.current_lang.get("main_window_settings_off").get()], root.current_lang.get("main_window_settings_on" if get_setting("keep_intermediates") else "main_window_settings_off").get())
         ]
 
         for key in range(len(settings_look_keys)):
@@ -375,6 +376,11 @@ class MainWindow(TkinterDnD.Tk):
             save_settings()
             customtkinter.set_appearance_mode(choice)
 
+    def settings_look_keep_intermediates_output(self, choice: str):
+        if root.settings is not None:
+            root.settings["keep_intermediates"] = choice == root.current_lang.get("main_window_settings_on").get()
+            save_settings()
+
     def settings_look_theme_output(self, choice: str):
         if root.settings is not None:
             root.settings["color_theme"] = choice
@@ -470,6 +476,8 @@ class MainWindow(TkinterDnD.Tk):
 
     def save_images_via_dialog(self, last: bool = False) -> Optional[str]:
         images = getattr(root.current_project, "temp_images", None)  # type: ignore
+        if isinstance(images, list):
+            images = [im for im in images if im is not None]
         if not images:
             return None
         if not isinstance(images, (list, tuple)):
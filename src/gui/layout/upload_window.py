@@ -4,7 +4,7 @@ from src.gui.utils.config_loader import get_setting
 import customtkinter
 from tkinterdnd2 import DND_FILES
 import os
-import cv2
+import src.processing.convolution.streaming as streaming
 from tkinter import filedialog
 
 
@@ -14,7 +14,7 @@ class UploadWindow(customtkinter.CTkToplevel):
     upload_filedialog_button: customtkinter.CTkButton | None = None
 
     text: customtkinter.CTkLabel | None = None
-    _supported_formats: tuple[str, str, str, str, str] = ('.png', '.jpg', '.jpeg', '.bmp', '.gif')
+    _supported_formats: tuple[str, str, str, str, str, str] = ('.png', '.jpg', '.jpeg', '.bmp', '.gif', '.npy')
 
     layout_settings: dict = {}
 
@@ -41,15 +41,15 @@ class UploadWindow(customtkinter.CTkToplevel):
         self.upload_filedialog_button.grid(row=1, column=0, sticky="ew", padx=self.layout_settings["upload_filedialog_button"]["padding"][0:2], pady=self.layout_settings["upload_filedialog_button"]["padding"][2:4])
 
     def filediloag_submit(self):
-        filepath = filedialog.askopenfilename(title=root.current_lang.get("upload_window_filedialog_window_title").get(), filetypes=[(root.current_lang.get("upload_window_filedialog_select_type_pretext").get(), "*.jpg;*.jpeg;*.png;*.bmp;*.gif")])
+        filepath = filedialog.askopenfilename(title=root.current_lang.get("upload_window_filedialog_window_title").get(), filetypes=[(root.current_lang.get("upload_window_filedialog_select_type_pretext").get(), "*.jpg;*.jpeg;*.png;*.bmp;*.gif;*.npy")])
         if os.path.isfile(filepath) and filepath.lower().endswith(self._supported_formats):
-            root.current_project.load_image(cv2.imread(filepath))
+            root.current_project.load_image(streaming.load_image(filepath))
             self.master.event_generate("<<UploadClosed>>")
             self.destroy()
 
     def on_drop(self, event):
         filepath = event.data.strip("{}")
         if os.path.isfile(filepath) and filepath.lower().endswith(self._supported_formats):
-            root.current_project.load_image(cv2.imread(filepath))
+            root.current_project.load_image(streaming.load_image(filepath))
             self.master.event_generate("<<UploadClosed>>")
             self.destroy()
@@ -20,6 +20,9 @@ class Error(Enum):
     CONVOLUTION_KERNAL_DIMENSION_EVEN = "Only odd kernal dimensions"
     CONVOLUTION_KERNAL_DATA_TYPE = "Kernel weight must be float or None"
     CONVOLUTION_IMAGE_DATA_TYPE = "Only support dtype: uint8 or float32"
+    CONVOLUTION_BORDER_MODE = "Unsupported border mode"
+    MORPHOLOGY_OPERATION = "Unsupported morphology operation"
+    STREAM_TEMP_REMOVE = "Could not remove temporary stream file"
     VERSION_GIT_VERSION = "Could not get buildid. Maybe not Git installed. Or you use compiled version."
     COMBOBOXEXTENDED_BIND_RESIZE = "Could not bind on resize"
     COMBOBOXEXTENDED_REMOVE_SCROLLBAR = "Could not remove scrollbar"
@@ -39,6 +42,7 @@ class Error(Enum):
     DRAW_KEYPOINT = "Wrong draw style"
     UNKNOWN_FEATURE = "Unknown Feature"
     IMAGE_NOT_NUMBER = "Image doesnt contain numbers"
+    SHARED_MEMORY_LEAK = "Shared memory blocks were not returned to the arena"
     XFEATURES2D = "Operation is not available in your OpenCV build. OpenCV must be built with OPENCV_ENABLE_NONFREE and xfeatures2d."
 
 
@@ -48,9 +52,16 @@ class Info(Enum):
     PRELOADING_STYLE = "Preloading style library"
     PRELOADING_KEYBINDING = "Preloading keybinding library"
     PRELOADING_PROJECT = "Preloading project library"
+    PRELOADING_WORKER_POOL = "Preloading worker pool"
     BUILDING_MAIN = "Building Main window"
     INIT_DONE = "Init Done!"
     CLOSE_WINDOW = "Window closed"
+    WORKER_POOL_STARTED = "Worker pool started"
+    WORKER_POOL_STOPPED = "Worker pool stopped"
+    CONVOLUTION_CALIBRATED = "Convolution backends calibrated"
+    SHARED_MEMORY_ARENA_CLOSED = "Shared memory arena closed"
+    TILE_PLAN = "Tile plan"
+    STREAMED_CONVOLUTION = "Streamed convolution through memory-mapped bands"
     RETURN_EMPTY_IMAGE = "Returning empty image"
     FORMAT_NESTED_RECURSIVE_REFERENCE = "↻ Recursive reference"
     FORMAT_NESTED_MAX_DEPTH = " ... [Line depth reached]"
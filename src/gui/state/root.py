@@ -12,7 +12,7 @@ all_lang: dict[str, str] = {}
 all_styles: dict[str, str | None] = {"blue": None,
                                      "dark-blue": None,
                                      "green": None}
-all_filter_types: list[str] = ["smoothing", "edge_detection", "median", "minimum", "maximum", "25%_quantile", "75%_quantile"]
+all_filter_types: list[str] = ["smoothing", "edge_detection", "median", "minimum", "maximum", "25%_quantile", "75%_quantile", "opening", "closing", "top_hat", "morph_gradient"]
 all_filters: dict[str, Action_Type] = {}
 all_keybindings: dict[str, str] | None = None
 version: str = "unknown"
@@ -11,3 +11,4 @@ class Settings_Type(TypedDict):
     version: str
     name: str
     license: str
+    keep_intermediates: bool
@@ -4,6 +4,10 @@ from src.processing.basic_stats_type import Basic_Stats
 from src.processing.test.quick_test import quick_test
 from src.gui.state.project_file_type import Action_Queue_Obj_Type, Action_Type, Filter_Type, Project_File_Type, empty_project
 import src.processing.action_handeling as action_processing
+import src.processing.filter_fusion as filter_fusion
+import src.processing.convolution.arena as arena
+import src.processing.convolution.streaming as streaming
+import src.processing.convolution.execution as execution
 import src.gui.state.root as root
 import re
 import json
@@ -19,7 +23,7 @@ class Project:
     progress: customtkinter.DoubleVar | None = None
     progress_test: customtkinter.DoubleVar | None = None
     action_queue: list[Action_Queue_Obj_Type] = []
-    temp_images: list[numpy.typing.NDArray[numpy.uint8 | numpy.float32]] = []
+    temp_images: list[numpy.typing.NDArray[numpy.uint8 | numpy.float32] | None] = []
     override_index = -1
     temp_stats: list[Basic_Stats] = []
     d_image: npt.NDArray[numpy.uint8] | None = None
@@ -27,6 +31,7 @@ class Project:
     test_results = None
     running: bool = False
     canceling: bool = False
+    cancel_token: int | None = None
 
     def get_filternames(self) -> list[str]:
         temp: list[str] = []
@@ -55,6 +60,27 @@ class Project:
         self.d_image = None
         self.running = False
         self.canceling = False
+        arena.clear()
+
+    def _restart(self):
+        done = len(self.temp_images)
+        self.action_queue = self.action_queue[0:done]
+        self.temp_stats = self.temp_stats[0:done]
+        self.running = False
+        self.canceling = False
+        self.apply_action_queue()
+
+    def _tile_progress(self, step: int, steps: int):
+        def report(done: int, total: int) -> None:
+            if self.progress and done < total:
+                self.progress.set((step + steps * done / total) / len(self.action_queue))
+            if root.status_details is not None:
+                root.status_details.set(f"{root.current_lang.get('status_details_tile_progress').get()} {done} / {total}")
+        return report
+
+    @staticmethod
+    def keep_intermediates() -> bool:
+        return root.settings is not None and bool(root.settings.get("keep_intermediates", False))
 
     def quick_test(self):
         if self.image is not None and len(self.temp_images) > 0:
@@ -72,8 +98,10 @@ class Project:
         if self.running is False:
             self.running = True
             self.canceling = False
+            self.cancel_token = execution.token()
         else:
             self.canceling = True
+            execution.cancel()
             return
         new_action_queue: list[Action_Queue_Obj_Type] = []
         for key in self.data["filterqueue"]:
@@ -104,13 +132,16 @@ class Project:
             self.running = False
             self.canceling = False
             return
+        while 0 < self.override_index <= len(self.temp_stats) and "fused_into" in (self.temp_stats[self.override_index - 1]["engine_stats"] or {}):
+            self.override_index -= 1
         self.action_queue = new_action_queue
         self.temp_images = self.temp_images[0:min(self.override_index, len(self.temp_images))]
         self.temp_stats = self.temp_stats[0:min(self.override_index, len(self.temp_stats))]
         self.d_image = None
         if self.progress:
             self.progress.set(0.0)
-        for i in range(self.override_index, len(self.action_queue)):
+        i = self.override_index
+        while i < len(self.action_queue):
             src_img: numpy.ndarray | None = None
             if i == 0:
                 src_img = self.image
@@ -118,6 +149,29 @@ class Project:
                 src_img = self.temp_images[i - 1]
             if src_img is None:
                 return
+            actions = [obj["data"] for obj in self.action_queue[i:]]
+            run = 1 if self.keep_intermediates() or streaming.should_stream(src_img) else filter_fusion.fusible_run_length(src_img, actions)
+            if run > 1:
+                names = " + ".join(a["data"]["name"] for a in actions[:run] if not isinstance(a["data"], str))
+                root.status.set(f"( {i+1}-{i+run} / {len(self.action_queue)} ) - {names}")
+                execution.set_progress(self._tile_progress(i, run))
+                try:
+                    fused_img, fused_stats = filter_fusion.apply_fused(src_img, actions[:run], cancel_token=self.cancel_token)
+                except execution.Cancelled:
+                    self._restart()
+                    break
+                finally:
+                    execution.set_progress(None)
+                self.temp_images.extend([None] * (run - 1) + [fused_img])
+                self.temp_stats.extend(fused_stats)
+                self.d_image = None
+                i += run
+                if self.progress:
+                    self.progress.set(i / len(self.action_queue))
+                if self.canceling:
+                    self._restart()
+                    break
+                continue
             action_data = self.action_queue[i]["data"]
             if action_data["type"] == "filter":
                 filter_data = action_data['data']
@@ -125,7 +179,14 @@ class Project:
                 root.status.set(f"( {i+1} / {len(self.action_queue)} ) - {filter_data['name']}")
             else:
                 root.status.set(f"( {i+1} / {len(self.action_queue)} ) - {action_data['data']}")
-            new_data = action_processing.apply_action(src_img, action_data, draw_image=self.d_image)
+            execution.set_progress(self._tile_progress(i, 1))
+            try:
+                new_data = action_processing.apply_action(src_img, action_data, draw_image=self.d_image, cancel_token=self.cancel_token)
+            except execution.Cancelled:
+                self._restart()
+                break
+            finally:
+                execution.set_progress(None)
             if new_data[2] is None or i + 1 < len(self.action_queue):
                 self.temp_images.append(new_data[0])
             else:
@@ -135,9 +196,9 @@ class Project:
             if self.progress:
                 self.progress.set((i + 1) / len(self.action_queue))
             if self.canceling:
-                self.reset_action_queue()
-                self.apply_action_queue()
+                self._restart()
                 break
+            i += 1
         if self.progress:
             root.status.set(root.current_lang.get("project_apply_action_queue_status_done").get())
             if self.progress.get() != 1.0:
@@ -3,6 +3,10 @@ import sys
 
 
 def restart_program():
+    import src.processing.convolution.pool
+    import src.processing.convolution.arena
+    src.processing.convolution.pool.shutdown()
+    src.processing.convolution.arena.shutdown()
     python = sys.executable
     os.execl(python, python, *sys.argv)
 
@@ -1,4 +1,6 @@
 from src.processing.pipeline.canny import canny
+from src.processing.pipeline.compass import compass
+from src.processing.pipeline.gradient import gradient
 from src.processing.feature.hough_circle import hough_circle
 from src.processing.feature.hough_rectangle import hough_rectangle
 from src.processing.utils.draw_keypoints import draw_keypoints
@@ -9,9 +11,13 @@ from src.processing.feature.sift import sift
 from src.processing.feature.surf import surf
 from src.processing.feature.harris import harris
 from src.processing.operations.gamma import gamma
+from src.processing.convolution.gaussian import gaussian
 from src.processing.basic_stats_type import Basic_Stats
 from src.processing.convolution.ranking import ranking
+from src.processing.convolution.morphology import morphology, MORPH_OPERATIONS
 from src.processing.convolution.default import default
+from src.processing.convolution.streaming import should_stream, stream_default, stream_ranking, stream_morphology
+from src.processing.filter_fusion import linear_kernel
 from src.gui.state.project_file_type import Action_Type
 from src.processing.operations.linear_contrast_stretch import linear_contrast_stretch
 from src.processing.operations.absolute import absolute
@@ -25,11 +31,12 @@ import time
 feature_mode: list[str] = ["harris", "surf", "sift", "orb", "fast", "hough_lines", "hough_circle", "hough_rectangle"]
 
 
-def apply_action(image: numpy.ndarray, action: Action_Type, draw_image: numpy.ndarray | None = None) -> tuple[npt.NDArray[numpy.uint8 | numpy.float32], Basic_Stats, npt.NDArray[numpy.uint8] | None]:  # type: ignore
+def apply_action(image: numpy.ndarray, action: Action_Type, draw_image: numpy.ndarray | None = None, cancel_token: int | None = None) -> tuple[npt.NDArray[numpy.uint8 | numpy.float32], Basic_Stats, npt.NDArray[numpy.uint8] | None]:  # type: ignore
     stats: Basic_Stats = {
         "time": -1,
         "action": action,
         "extended_stats": None,
+        "engine_stats": None,
     }
     start_time = time.time()
     new_img: npt.NDArray[numpy.uint8 | numpy.float32] | None = None
@@ -40,13 +47,20 @@ def apply_action(image: numpy.ndarray, action: Action_Type, draw_image: numpy.nd
             assert not isinstance(data, str)
             if data["settings"]["type"] in ("median", "minimum", "maximum", "25%_quantile", "75%_quantile"):
                 kernal = [[1 if y["disabled"] else None for y in x] for x in data["grid"]]
-                new_img = ranking(image, kernal, mode=data["settings"]["type"], stride=data["settings"]["spatial_sampling_rate"])  # type: ignore
+                stats["engine_stats"] = {}
+                new_img = (stream_ranking if should_stream(image) else ranking)(image, kernal, mode=data["settings"]["type"], stride=data["settings"]["spatial_sampling_rate"], engine_stats=stats["engine_stats"], cancel_token=cancel_token)  # type: ignore
+            elif data["settings"]["type"] in MORPH_OPERATIONS:
+                kernal = [[1 if y["disabled"] else None for y in x] for x in data["grid"]]
+                stats["engine_stats"] = {}
+                new_img = (stream_morphology if should_stream(image) else morphology)(image, kernal, operation=data["settings"]["type"], stride=data["settings"]["spatial_sampling_rate"], engine_stats=stats["engine_stats"], cancel_token=cancel_token)  # type: ignore
             elif data["settings"]["type"] == "smoothing":
-                kernal = [[y["value"] * data["settings"]["factor"] for y in x] for x in data["grid"]]
-                new_img = default(image, kernal, stride=data["settings"]["spatial_sampling_rate"])  # type: ignore
+                kernal = linear_kernel(data)
+                stats["engine_stats"] = {}
+                new_img = (stream_default if should_stream(image) else default)(image, kernal, stride=data["settings"]["spatial_sampling_rate"], engine_stats=stats["engine_stats"], cancel_token=cancel_token)  # type: ignore
             elif data["settings"]["type"] == "edge_detection":
-                kernal = [[y["value"] for y in x] for x in data["grid"]]
-                new_img = default(image, kernal, stride=data["settings"]["spatial_sampling_rate"], edge_filter=True)  # type: ignore
+                kernal = linear_kernel(data)
+                stats["engine_stats"] = {}
+                new_img = (stream_default if should_stream(image) else default)(image, kernal, stride=data["settings"]["spatial_sampling_rate"], edge_filter=True, engine_stats=stats["engine_stats"], cancel_token=cancel_token)  # type: ignore
         case "operation":
             assert isinstance(data, str)
             match data:
@@ -70,6 +84,18 @@ def apply_action(image: numpy.ndarray, action: Action_Type, draw_image: numpy.nd
                     new_img = gamma(image, 2.0)
                 case "gamma_400":
                     new_img = gamma(image, 4.0)
+                case "gaussian_s2":
+                    stats["engine_stats"] = {}
+                    new_img = gaussian(image, 2.0, engine_stats=stats["engine_stats"], cancel_token=cancel_token)
+                case "gaussian_s4":
+                    stats["engine_stats"] = {}
+                    new_img = gaussian(image, 4.0, engine_stats=stats["engine_stats"], cancel_token=cancel_token)
+                case "gaussian_s8":
+                    stats["engine_stats"] = {}
+                    new_img = gaussian(image, 8.0, engine_stats=stats["engine_stats"], cancel_token=cancel_token)
+                case "gaussian_s16":
+                    stats["engine_stats"] = {}
+                    new_img = gaussian(image, 16.0, engine_stats=stats["engine_stats"], cancel_token=cancel_token)
         case "feature":
             assert isinstance(data, str)
             if data in feature_mode:
@@ -108,6 +134,18 @@ def apply_action(image: numpy.ndarray, action: Action_Type, draw_image: numpy.nd
             assert isinstance(data, str)
             if data == "canny":
                 new_img = canny(image)
+            elif data in ("kirsch_compass", "prewitt_compass"):
+                new_img, orientation = compass(image, data.split("_")[0])
+                stats["extended_stats"] = {
+                    "orientation": orientation
+                }
+            elif data in ("sobel_gradient", "scharr_gradient", "prewitt_gradient", "sobel_gradient_nms"):
+                stats["engine_stats"] = {}
+                new_img, orientation = gradient(image, data.split("_")[0], nms=data.endswith("_nms"), engine_stats=stats["engine_stats"])
+                if orientation is not None:
+                    stats["extended_stats"] = {
+                        "orientation": orientation
+                    }
     stats["time"] = time.time() - start_time
     if new_img is not None:
         return (new_img, stats, None)
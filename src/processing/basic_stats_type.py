@@ -7,3 +7,4 @@ class Basic_Stats(TypedDict):
     time: float
     action: Action_Type
     extended_stats: dict[str, Any] | None
+    engine_stats: dict[str, Any] | None
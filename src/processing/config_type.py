@@ -1,6 +1,8 @@
 from typing_extensions import TypedDict
 
 from src.processing.types.canny_type import Canny_Type
+from src.processing.types.compass_type import Compass_Type
+from src.processing.types.gradient_type import Gradient_Type
 from src.processing.types.hough_rectangle_type import Hough_Rectangle_Type
 from src.processing.types.hough_circle_type import Hough_Circle_Type
 from src.processing.types.hough_lines_type import Hough_Lines_Type
@@ -22,6 +24,8 @@ class Config_Processing_Feature_Type(TypedDict):
 
 class Config_Processing_Pipeline_Type(TypedDict):
     canny: Canny_Type | None
+    compass: Compass_Type | None
+    gradient: Gradient_Type | None
 
 
 class Config_Processing_Stats_Threshold_Type(TypedDict):
@@ -0,0 +1,129 @@
+import atexit
+import threading
+import weakref
+from collections import deque
+from multiprocessing import shared_memory
+from pathlib import Path
+import numpy as np
+import src.gui.utils.logger as log
+from src.gui.state.error import Error, Info
+
+
+MIN_BLOCK_BYTES: int = 1 << 16
+MAX_FREE_BYTES: int = 1 << 31
+
+_lock = threading.Lock()
+_free: dict[int, deque[shared_memory.SharedMemory]] = {}
+_free_bytes: int = 0
+_checked_out: dict[str, shared_memory.SharedMemory] = {}
+_adopted: dict[str, shared_memory.SharedMemory] = {}
+_closed: bool = False
+_created: int = 0
+
+
+def size_class(nbytes: int) -> int:
+    if nbytes <= MIN_BLOCK_BYTES:
+        return MIN_BLOCK_BYTES
+    step = 1 << ((nbytes - 1).bit_length() - 3)
+    return ((nbytes + step - 1) // step) * step
+
+
+def _destroy(shm: shared_memory.SharedMemory) -> None:
+    shm.close()
+    try:
+        shm.unlink()
+    except FileNotFoundError:
+        pass
+
+
+def acquire(nbytes: int) -> shared_memory.SharedMemory:
+    global _free_bytes, _created
+    size = size_class(nbytes)
+    with _lock:
+        bucket = _free.get(size)
+        if bucket:
+            shm = bucket.popleft()
+            _free_bytes -= size
+        else:
+            shm = shared_memory.SharedMemory(create=True, size=size)
+            _created += 1
+        _checked_out[shm.name] = shm
+    return shm
+
+
+def recycle(shm: shared_memory.SharedMemory) -> None:
+    global _free_bytes
+    with _lock:
+        if _checked_out.pop(shm.name, None) is None and _adopted.pop(shm.name, None) is None:
+            return
+        if _closed:
+            _destroy(shm)
+            return
+        _free.setdefault(shm.size, deque()).append(shm)
+        _free_bytes += shm.size
+        while _free_bytes > MAX_FREE_BYTES:
+            size = max(s for s, b in _free.items() if b)
+            _destroy(_free[size].popleft())
+            _free_bytes -= size
+
+
+def discard(shm: shared_memory.SharedMemory) -> None:
+    with _lock:
+        if _checked_out.pop(shm.name, None) is None and _adopted.pop(shm.name, None) is None:
+            return
+    _destroy(shm)
+
+
+def adopt(shm: shared_memory.SharedMemory, shape: tuple[int, ...], dtype: np.dtype | type) -> np.ndarray:
+    array = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+    with _lock:
+        _checked_out.pop(shm.name, None)
+        _adopted[shm.name] = shm
+    weakref.finalize(array, recycle, shm)
+    return array
+
+
+def clear() -> None:
+    global _free_bytes
+    with _lock:
+        for bucket in _free.values():
+            while bucket:
+                _destroy(bucket.popleft())
+        _free.clear()
+        _free_bytes = 0
+
+
+def stats() -> dict[str, int]:
+    with _lock:
+        return {
+            "free_blocks": sum(len(b) for b in _free.values()),
+            "free_bytes": _free_bytes,
+            "checked_out": len(_checked_out),
+            "adopted": len(_adopted),
+            "created": _created
+        }
+
+
+def shutdown() -> None:
+    global _closed
+    if _closed:
+        return
+    clear()
+    with _lock:
+        _closed = True
+        leaked = list(_checked_out.values())
+        _checked_out.clear()
+        for shm in leaked:
+            _destroy(shm)
+        for shm in _adopted.values():
+            try:
+                shm.unlink()
+            except FileNotFoundError:
+                pass
+    if leaked:
+        log.log.write(text=f"{Error.SHARED_MEMORY_LEAK.value} ({len(leaked)} blocks, {sum(s.size for s in leaked)} bytes)", tag="WARNING", modulename=Path(__file__).stem)
+    if _created > 0:
+        log.log.write(text=f"{Info.SHARED_MEMORY_ARENA_CLOSED.value} (blocks={_created})", tag="INFO", modulename=Path(__file__).stem)
+
+
+atexit.register(shutdown)
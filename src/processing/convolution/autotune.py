@@ -0,0 +1,198 @@
+import os
+import json
+import math
+import time
+import platform
+from pathlib import Path
+from typing import Callable, Tuple
+import numpy as np
+import cv2
+import src.gui.utils.logger as log
+from src.gui.state.error import Info
+import src.processing.convolution.pool as pool
+
+
+CALIBRATION_PATH: str = "./src/assets/calibration/convolution.json"
+OPENCV_DFT_TAPS: int = 121
+BACKENDS: tuple[str, ...] = ("direct", "integer", "separable", "lowrank", "box", "fft", "opencv")
+
+_CALIBRATION_TILE: int = 256
+_CALIBRATION_REPEATS: int = 3
+
+_coefficients: dict[str, float] | None = None
+
+
+def machine_key() -> str:
+    return "|".join([
+        platform.node(),
+        platform.machine(),
+        platform.processor() or "-",
+        str(os.cpu_count()),
+        np.__version__,
+        cv2.__version__
+    ])
+
+
+def _fft_shape(tile_h: int, tile_w: int, kH: int, kW: int, sy: int, sx: int) -> Tuple[int, int]:
+    return cv2.getOptimalDFTSize((tile_h - 1) * sy + kH), cv2.getOptimalDFTSize((tile_w - 1) * sx + kW)
+
+
+def work_units(
+    backend: str,
+    k_shape: Tuple[int, int],
+    taps: int,
+    out_hw: Tuple[int, int],
+    stride: Tuple[int, int],
+    channels: int,
+    tile: Tuple[int, int],
+    rank: int = 1
+) -> float:
+    kH, kW = k_shape
+    out_h, out_w = out_hw
+    sy, sx = stride
+    if backend in ("direct", "integer"):
+        return float(channels * out_h * out_w * taps)
+    if backend in ("separable", "lowrank"):
+        return float(channels * rank * (((out_h - 1) * sy + kH) * out_w * kW + out_h * out_w * kH))
+    if backend == "box":
+        return float(channels * (((out_h - 1) * sy + kH) * ((out_w - 1) * sx + kW) + out_h * out_w))
+    if backend == "fft":
+        tile_h, tile_w = min(tile[0], out_h), min(tile[1], out_w)
+        fh, fw = _fft_shape(tile_h, tile_w, kH, kW, sy, sx)
+        n_tiles = math.ceil(out_h / tile_h) * math.ceil(out_w / tile_w)
+        return float(channels * n_tiles * fh * fw * math.log2(fh * fw))
+    return float(channels * (out_h * sy) * (out_w * sx) * min(taps, OPENCV_DFT_TAPS))
+
+
+def _best_time(fn: Callable[[], object]) -> float:
+    best = math.inf
+    for _ in range(_CALIBRATION_REPEATS):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return max(best, 1e-9)
+
+
+def calibrate() -> dict[str, float]:
+    import src.processing.convolution.default as engine
+
+    rng = np.random.default_rng(0)
+    t = _CALIBRATION_TILE
+    k = rng.standard_normal((7, 7)).astype(np.float32)
+    k_fft = rng.standard_normal((15, 15)).astype(np.float32)
+    padded = rng.random((t + 14, t + 14)).astype(np.float32)
+    out = np.empty((t, t), dtype=np.float32)
+    positions = engine._fold_taps(k)
+    image = rng.random((2 * t, 2 * t)).astype(np.float32)
+    buf = np.empty((2 * t + 6, 2 * t + 6), dtype=np.float32)
+
+    coefficients: dict[str, float] = {}
+    coefficients["direct"] = _best_time(
+        lambda: engine._convolve_block_gray(padded, out, 0, t, 0, t, 1, 1, positions)
+    ) / work_units("direct", (7, 7), 49, (t, t), (1, 1), 1, (t, t))
+    padded_u8 = (padded * 255).astype(np.uint8)
+    out_i16 = np.empty((t, t), dtype=np.int16)
+    positions_int = engine._fold_taps(np.round(k * 4))
+    coefficients["integer"] = _best_time(
+        lambda: engine._convolve_block_gray_integer(padded_u8, out_i16, 0, t, 0, t, 1, 1, positions_int)
+    ) / work_units("integer", (7, 7), 49, (t, t), (1, 1), 1, (t, t))
+    coefficients["separable"] = _best_time(
+        lambda: engine._convolve_block_gray_separable(padded, out, 0, t, 0, t, 1, 1, engine._fold_taps(k[:, :1]), engine._fold_taps(k[:1, :]))
+    ) / work_units("separable", (7, 7), 49, (t, t), (1, 1), 1, (t, t))
+    coefficients["lowrank"] = _best_time(
+        lambda: engine._convolve_block_gray_lowrank(padded, out, 0, t, 0, t, 1, 1, k[:2, :], k[2:4, :])
+    ) / work_units("lowrank", (7, 7), 49, (t, t), (1, 1), 1, (t, t), rank=2)
+    coefficients["box"] = _best_time(
+        lambda: engine._convolve_block_gray_box(padded, out, 0, t, 0, t, 1, 1, (7, 7, 1.0 / 49.0))
+    ) / work_units("box", (7, 7), 49, (t, t), (1, 1), 1, (t, t))
+    coefficients["fft"] = _best_time(
+        lambda: engine._convolve_block_gray_fft(padded, out, 0, t, 0, t, 1, 1, k_fft)
+    ) / work_units("fft", (15, 15), 225, (t, t), (1, 1), 1, (t, t))
+    coefficients["opencv"] = _best_time(
+        lambda: cv2.filter2D(image, cv2.CV_32F, k, borderType=cv2.BORDER_CONSTANT)
+    ) / work_units("opencv", (7, 7), 49, image.shape, (1, 1), 1, (t, t))  # type: ignore
+    coefficients["copy"] = _best_time(
+        lambda: np.copyto(buf, np.pad(image, ((3, 3), (3, 3)), mode="constant"))
+    ) / image.size
+    ex = pool.get_executor()
+    coefficients["dispatch"] = _best_time(lambda: ex.submit(os.getpid).result())
+    return coefficients
+
+
+def load_coefficients() -> dict[str, float]:
+    global _coefficients
+    if _coefficients is not None:
+        return _coefficients
+    key = machine_key()
+    path = Path(CALIBRATION_PATH)
+    cache: dict[str, dict[str, float]] = {}
+    if path.exists():
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            cache = {}
+    entry = cache.get(key)
+    if entry is None or any(b not in entry for b in BACKENDS):
+        entry = calibrate()
+        cache[key] = entry
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(cache, f, indent=4)
+        log.log.write(text=f"{Info.CONVOLUTION_CALIBRATED.value} ({path})", tag="INFO", modulename=Path(__file__).stem)
+    _coefficients = entry
+    return entry
+
+
+def predict(
+    backend: str,
+    k_shape: Tuple[int, int],
+    taps: int,
+    out_hw: Tuple[int, int],
+    stride: Tuple[int, int],
+    channels: int,
+    tile: Tuple[int, int],
+    workers: int,
+    rank: int = 1
+) -> float:
+    coefficients = load_coefficients()
+    compute = coefficients[backend] * work_units(backend, k_shape, taps, out_hw, stride, channels, tile, rank)
+    if backend == "opencv":
+        return compute
+    out_h, out_w = out_hw
+    sy, sx = stride
+    n_tiles = math.ceil(out_h / tile[0]) * math.ceil(out_w / tile[1])
+    parallel = max(1, min(workers, n_tiles))
+    copy = coefficients["copy"] * channels * (out_h * sy) * (out_w * sx)
+    return copy + (coefficients["dispatch"] * n_tiles + compute) / parallel
+
+
+def select_backend(
+    k2d: np.ndarray,
+    is_sep: bool,
+    is_box: bool,
+    is_integer: bool,
+    rank: int,
+    out_hw: Tuple[int, int],
+    stride: Tuple[int, int],
+    channels: int,
+    tile: Tuple[int, int],
+    workers: int
+) -> Tuple[str, float, dict[str, float]]:
+    k_shape = (int(k2d.shape[0]), int(k2d.shape[1]))
+    taps = int(np.count_nonzero(k2d))
+    candidates = ["direct", "fft", "opencv"]
+    if is_box:
+        candidates.append("box")
+    if is_integer:
+        candidates.append("integer")
+    if is_sep:
+        candidates.append("separable")
+    elif 1 < rank and rank * (k_shape[0] + k_shape[1]) < taps:
+        candidates.append("lowrank")
+    predictions = {
+        b: predict(b, k_shape, k_shape[0] + k_shape[1] if (b == "opencv" and is_sep) else taps, out_hw, stride, channels, tile, workers, rank)
+        for b in candidates
+    }
+    best = min(predictions, key=predictions.__getitem__)
+    return best, predictions[best], predictions
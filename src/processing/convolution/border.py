@@ -0,0 +1,66 @@
+from pathlib import Path
+from typing import Literal, Tuple
+import numpy as np
+import cv2
+import src.gui.utils.logger as log
+from src.gui.state.error import Error
+
+
+Border_Mode = Literal["constant", "reflect", "edge", "wrap", "valid"]
+
+BORDER_MODES: Tuple[str, ...] = ("constant", "reflect", "edge", "wrap", "valid")
+CV2_BORDERS: dict[str, int] = {
+    "constant": cv2.BORDER_CONSTANT,
+    "reflect": cv2.BORDER_REFLECT_101,
+    "edge": cv2.BORDER_REPLICATE,
+    "valid": cv2.BORDER_CONSTANT
+}
+
+
+def check(mode: str) -> None:
+    if mode not in BORDER_MODES:
+        log.log.write(text=f"{Error.CONVOLUTION_BORDER_MODE.value} ({mode})", tag="CRITICAL ERROR", modulename=Path(__file__).stem)
+
+
+def origin(k_shape: Tuple[int, int], mode: str) -> Tuple[int, int]:
+    if mode == "valid":
+        return 0, 0
+    return k_shape[0] // 2, k_shape[1] // 2
+
+
+def output_shape(hw: Tuple[int, int], k_shape: Tuple[int, int], stride: Tuple[int, int], mode: str) -> Tuple[int, int]:
+    H, W = hw
+    sy, sx = stride
+    if mode == "valid":
+        return max(0, (H - k_shape[0]) // sy + 1), max(0, (W - k_shape[1]) // sx + 1)
+    return (H + sy - 1) // sy, (W + sx - 1) // sx
+
+
+def _indices(a0: int, a1: int, n: int, mode: str) -> np.ndarray:
+    before, after = max(0, -a0), max(0, a1 - n)
+    index = np.pad(np.arange(n), (before, after), mode=mode)  # type: ignore
+    return index[a0 + before:a1 + before]
+
+
+def window(
+    src: np.ndarray,
+    r0: int,
+    r1: int,
+    c0: int,
+    c1: int,
+    mode: str,
+    dtype: np.dtype | type | None = None,
+    fill: float = 0.0
+) -> np.ndarray:
+    H, W = src.shape[:2]
+    dtype = src.dtype if dtype is None else np.dtype(dtype)
+    if r0 >= 0 and c0 >= 0 and r1 <= H and c1 <= W:
+        return src[r0:r1, c0:c1].astype(dtype, copy=False)
+    if mode in ("constant", "valid"):
+        slab = np.full((r1 - r0, c1 - c0), fill, dtype=dtype)
+        y0, y1, x0, x1 = max(r0, 0), min(r1, H), max(c0, 0), min(c1, W)
+        if y0 < y1 and x0 < x1:
+            np.copyto(slab[y0 - r0:y1 - r0, x0 - c0:x1 - c0], src[y0:y1, x0:x1], casting="unsafe")
+        return slab
+    rows, cols = _indices(r0, r1, H, mode), _indices(c0, c1, W, mode)
+    return src[np.ix_(rows, cols)].astype(dtype, copy=False)
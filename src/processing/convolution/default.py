@@ -1,50 +1,91 @@
-import os
-from typing import Tuple, List
+import time
+from typing import Any, Callable, Tuple, List
 import numpy as np
 import numpy.typing as npt
-from concurrent.futures import ProcessPoolExecutor, as_completed
-from multiprocessing import shared_memory
 import cv2
 from src.gui.state.error import Error
 from src.gui.state import root
 import src.gui.utils.logger as log
 from pathlib import Path
+import src.processing.convolution.pool as pool
+import src.processing.convolution.autotune as autotune
+import src.processing.convolution.execution as execution
+import src.processing.convolution.tiling as tiling
+import src.processing.convolution.border as border
 
 
-TILE_SIZE: int = 1024
-KEEP_FREE_CORES: int = 1
+TILE_SIZE: int | None = None
 SUPPRESS_PADDING_BORDER: bool = False
+FFT_BREAK_EVEN_TAPS: int = 64
+AUTOTUNE: bool = True
+LOW_RANK_TOLERANCE: float = 1e-6
+INTEGER_EXACT_LIMIT: int = 1 << 24
+FOLD_TOLERANCE: float = 1e-6
 
+Folded_Taps = List[Tuple[int, int, int, int, float, int]]
 
-def _worker_convolve_tile(
-    shm_in_name: str,
-    in_shape: Tuple[int, ...],
-    shm_out_name: str,
-    out_shape: Tuple[int, ...],
-    tile_ij: Tuple[int, int, int, int],
-    kernel_positions: List[Tuple[int, int, float]],
+
+def _convolve_tile(
+    src: np.ndarray,
+    out: np.ndarray,
+    tile_ij: Tuple[int, ...],
+    block: Callable[..., None],
+    block_args: Tuple[Any, ...],
     stride: Tuple[int, int],
-    channels: int
+    channels: int,
+    k_shape: Tuple[int, int],
+    pad_mode: str,
+    dtype: np.dtype
 ) -> None:
     sy, sx = stride
-    i0, i1, j0, j1 = tile_ij
-    tile_h, tile_w = i1 - i0, j1 - j0
+    kH, kW = k_shape
+    oh, ow = border.origin(k_shape, pad_mode)
+    i0, i1, j0, j1 = tile_ij[:4]
+    r0, c0 = i0 * sy - oh, j0 * sx - ow
+    r1, c1 = (i1 - 1) * sy - oh + kH, (j1 - 1) * sx - ow + kW
+    if channels == 1:
+        slab = border.window(src, r0, r1, c0, c1, pad_mode, dtype)
+        block(slab, out[i0:i1, j0:j1], 0, i1 - i0, 0, j1 - j0, sy, sx, *block_args)
+    else:
+        ch0, ch1 = tile_ij[4:] if len(tile_ij) == 6 else (0, channels)
+        for c in range(ch0, ch1):
+            slab = border.window(src[c], r0, r1, c0, c1, pad_mode, dtype)
+            block(slab, out[i0:i1, j0:j1, c], 0, i1 - i0, 0, j1 - j0, sy, sx, *block_args)
+
+
+def _fold_taps(k2d: np.ndarray, tol: float = 0.0) -> Folded_Taps:
+    kH, kW = k2d.shape
+    limit = tol * float(np.abs(k2d).max()) if k2d.size else 0.0
+    used = np.zeros((kH, kW), dtype=bool)
+    taps: Folded_Taps = []
+    for dy in range(kH):
+        for dx in range(kW):
+            w = float(k2d[dy, dx])
+            if used[dy, dx] or w == 0.0:
+                continue
+            my, mx = kH - 1 - dy, kW - 1 - dx
+            used[dy, dx] = used[my, mx] = True
+            m = float(k2d[my, mx])
+            if (my, mx) != (dy, dx) and abs(m - w) <= limit:
+                taps.append((dy, dx, my, mx, w, 1))
+            elif (my, mx) != (dy, dx) and abs(m + w) <= limit:
+                taps.append((dy, dx, my, mx, w, -1))
+            else:
+                taps.append((dy, dx, dy, dx, w, 0))
+                if m != 0.0 and (my, mx) != (dy, dx):
+                    taps.append((my, mx, my, mx, m, 0))
+    return taps
 
-    shm_in = shared_memory.SharedMemory(name=shm_in_name)
-    shm_out = shared_memory.SharedMemory(name=shm_out_name)
-    try:
-        if channels == 1:
-            padded = np.ndarray(in_shape, dtype=np.float32, buffer=shm_in.buf)
-            out = np.ndarray(out_shape, dtype=np.float32, buffer=shm_out.buf)
-            _convolve_block_gray(padded, out, i0, i1, j0, j1, sy, sx, kernel_positions, tile_h, tile_w)
-        else:
-            padded = np.ndarray(in_shape, dtype=np.float32, buffer=shm_in.buf)
-            out = np.ndarray(out_shape, dtype=np.float32, buffer=shm_out.buf)
-            for c in range(channels):
-                _convolve_block_gray(padded[..., c], out[..., c], i0, i1, j0, j1, sy, sx, kernel_positions, tile_h, tile_w)
-    finally:
-        shm_in.close()
-        shm_out.close()
+
+def _kernel_symmetry(k2d: np.ndarray) -> str:
+    mirrored = k2d[::-1, ::-1]
+    if np.array_equal(k2d, mirrored):
+        return "symmetric"
+    if np.array_equal(k2d, -mirrored):
+        return "antisymmetric"
+    if np.any((k2d != 0) & ((k2d == mirrored) | (k2d == -mirrored))):
+        return "partial"
+    return "none"
 
 
 def _convolve_block_gray(
@@ -56,62 +97,112 @@ def _convolve_block_gray(
     j1: int,
     sy: int,
     sx: int,
-    kernel_positions: List[Tuple[int, int, float]],
-    tile_h: int,
-    tile_w: int
+    kernel_taps: Folded_Taps
 ) -> None:
+    tile_h, tile_w = i1 - i0, j1 - j0
     acc = np.zeros((tile_h, tile_w), dtype=np.float32)
     tmp = np.empty((tile_h, tile_w), dtype=np.float32)
-    for pos_y, pos_x, w in kernel_positions:
-        if w == 0.0:
-            continue
+    for pos_y, pos_x, mir_y, mir_x, w, sign in kernel_taps:
         rs = slice(pos_y + i0 * sy, pos_y + i1 * sy, sy)
         cs = slice(pos_x + j0 * sx, pos_x + j1 * sx, sx)
-        np.multiply(padded[rs, cs], w, out=tmp)
+        if sign == 0:
+            np.multiply(padded[rs, cs], w, out=tmp)
+        else:
+            mrs = slice(mir_y + i0 * sy, mir_y + i1 * sy, sy)
+            mcs = slice(mir_x + j0 * sx, mir_x + j1 * sx, sx)
+            (np.add if sign > 0 else np.subtract)(padded[rs, cs], padded[mrs, mcs], out=tmp)
+            if w != 1.0:
+                np.multiply(tmp, w, out=tmp)
         np.add(acc, tmp, out=acc)
     out[i0:i1, j0:j1] = acc
 
 
-def _worker_convolve_tile_separable(
-    shm_in_name: str,
-    in_shape: Tuple[int, ...],
-    shm_out_name: str,
-    out_shape: Tuple[int, ...],
-    tile_ij: Tuple[int, int, int, int],
-    ky: np.ndarray,
-    kx: np.ndarray,
-    stride: Tuple[int, int],
-    channels: int
+def _convolve_block_gray_integer(
+    padded: np.ndarray,
+    out: np.ndarray,
+    i0: int,
+    i1: int,
+    j0: int,
+    j1: int,
+    sy: int,
+    sx: int,
+    kernel_taps: Folded_Taps
 ) -> None:
-    sy, sx = stride
-    i0, i1, j0, j1 = tile_ij
-
-    shm_in = shared_memory.SharedMemory(name=shm_in_name)
-    shm_out = shared_memory.SharedMemory(name=shm_out_name)
-    try:
-        if channels == 1:
-            padded = np.ndarray(in_shape, dtype=np.float32, buffer=shm_in.buf)
-            out = np.ndarray(out_shape, dtype=np.float32, buffer=shm_out.buf)
-            _convolve_block_gray_separable(padded, out, i0, i1, j0, j1, sy, sx, ky, kx)
+    tile_h, tile_w = i1 - i0, j1 - j0
+    acc = np.zeros((tile_h, tile_w), dtype=out.dtype)
+    tmp = np.empty((tile_h, tile_w), dtype=out.dtype)
+    for pos_y, pos_x, mir_y, mir_x, w, sign in kernel_taps:
+        rs = slice(pos_y + i0 * sy, pos_y + i1 * sy, sy)
+        cs = slice(pos_x + j0 * sx, pos_x + j1 * sx, sx)
+        if sign == 0:
+            src = padded[rs, cs]
         else:
-            padded = np.ndarray(in_shape, dtype=np.float32, buffer=shm_in.buf)
-            out = np.ndarray(out_shape, dtype=np.float32, buffer=shm_out.buf)
-            for c in range(channels):
-                _convolve_block_gray_separable(padded[..., c], out[..., c], i0, i1, j0, j1, sy, sx, ky, kx)
-    finally:
-        shm_in.close()
-        shm_out.close()
+            mrs = slice(mir_y + i0 * sy, mir_y + i1 * sy, sy)
+            mcs = slice(mir_x + j0 * sx, mir_x + j1 * sx, sx)
+            (np.add if sign > 0 else np.subtract)(padded[rs, cs], padded[mrs, mcs], out=tmp, dtype=out.dtype)
+            src = tmp
+        if w == 1:
+            np.add(acc, src, out=acc)
+        elif w == -1:
+            np.subtract(acc, src, out=acc)
+        else:
+            np.multiply(src, out.dtype.type(w), out=tmp)
+            np.add(acc, tmp, out=acc)
+    out[i0:i1, j0:j1] = acc
 
 
 def _convolve_block_gray_separable(
     padded: np.ndarray, out: np.ndarray,
     i0: int, i1: int, j0: int, j1: int,
     sy: int, sx: int,
-    ky: np.ndarray,
-    kx: np.ndarray
+    taps_y: Folded_Taps,
+    taps_x: Folded_Taps
+) -> None:
+    kH = max(max(t[0], t[2]) for t in taps_y) + 1 if taps_y else 1
+    tile_h = i1 - i0
+    tile_w = j1 - j0
+
+    r_start = i0 * sy
+    R = (i1 - 1) * sy + kH - r_start
+
+    H = np.zeros((R, tile_w), dtype=np.float32)
+    tmp = np.empty((R, tile_w), dtype=np.float32)
+    rows = slice(r_start, r_start + R)
+    for _, dx, _, mx, w, sign in taps_x:
+        cs = slice(j0 * sx + dx, j0 * sx + dx + tile_w * sx, sx)
+        if sign == 0:
+            np.multiply(padded[rows, cs], w, out=tmp)
+        else:
+            mcs = slice(j0 * sx + mx, j0 * sx + mx + tile_w * sx, sx)
+            (np.add if sign > 0 else np.subtract)(padded[rows, cs], padded[rows, mcs], out=tmp)
+            if w != 1.0:
+                np.multiply(tmp, w, out=tmp)
+        np.add(H, tmp, out=H)
+    acc = np.zeros((tile_h, tile_w), dtype=np.float32)
+    tmp = tmp[:tile_h]
+    for dy, _, my, _, w, sign in taps_y:
+        rs = slice(dy, dy + tile_h * sy, sy)
+        if sign == 0:
+            np.multiply(H[rs], w, out=tmp)
+        else:
+            (np.add if sign > 0 else np.subtract)(H[rs], H[slice(my, my + tile_h * sy, sy)], out=tmp)
+            if w != 1.0:
+                np.multiply(tmp, w, out=tmp)
+        np.add(acc, tmp, out=acc)
+
+    out[i0:i1, j0:j1] = acc
+
+
+def _convolve_block_gray_lowrank(
+    padded: np.ndarray, out: np.ndarray,
+    i0: int, i1: int, j0: int, j1: int,
+    sy: int, sx: int,
+    kys: np.ndarray,
+    kxs: np.ndarray
 ) -> None:
-    kH = int(ky.shape[0])
-    kW = int(kx.shape[0])
+    rank = int(kys.shape[0])
+    kH = int(kys.shape[1])
+    kW = int(kxs.shape[1])
     tile_h = i1 - i0
     tile_w = j1 - j0
 
@@ -119,35 +210,128 @@ def _convolve_block_gray_separable(
     r_end = (i1 - 1) * sy + (kH - 1)
     R = r_end - r_start + 1
 
-    c0_vec = (np.arange(j0, j1, dtype=np.int64) * sx)
-    H = np.zeros((R, tile_w), dtype=np.float32)
+    H = np.zeros((rank, R, tile_w), dtype=np.float32)
+    tmp = np.empty((R, tile_w), dtype=np.float32)
 
-    rows = np.arange(r_start, r_end + 1, dtype=np.int64)
     for dx in range(kW):
-        cols = c0_vec + dx
-        np.add(H, padded[rows[:, None], cols[None, :]] * kx[dx], out=H)
+        cs = slice(j0 * sx + dx, j0 * sx + dx + tile_w * sx, sx)
+        slab = padded[r_start:r_end + 1, cs]
+        for r in range(rank):
+            np.multiply(slab, kxs[r, dx], out=tmp)
+            np.add(H[r], tmp, out=H[r])
     acc = np.zeros((tile_h, tile_w), dtype=np.float32)
-    for dy in range(kH):
-        rs = slice(dy, dy + tile_h * sy, sy)
-        np.add(acc, H[rs, :] * ky[dy], out=acc)
+    for r in range(rank):
+        for dy in range(kH):
+            rs = slice(dy, dy + tile_h * sy, sy)
+            np.add(acc, H[r, rs, :] * kys[r, dy], out=acc)
 
     out[i0:i1, j0:j1] = acc
 
 
-def _is_multichannel_gray(image_f32: np.ndarray) -> bool:
-    if image_f32.ndim != 3 or image_f32.shape[2] < 2:
+def _convolve_block_gray_box(
+    padded: np.ndarray, out: np.ndarray,
+    i0: int, i1: int, j0: int, j1: int,
+    sy: int, sx: int,
+    box: Tuple[int, int, float]
+) -> None:
+    kH, kW, weight = box
+    tile_h = i1 - i0
+    tile_w = j1 - j0
+
+    r_start, c_start = i0 * sy, j0 * sx
+    R = (i1 - 1) * sy + kH - r_start
+    C = (j1 - 1) * sx + kW - c_start
+
+    sat = np.zeros((R + 1, C + 1), dtype=np.float64)
+    np.cumsum(padded[r_start:r_start + R, c_start:c_start + C], axis=0, dtype=np.float64, out=sat[1:, 1:])
+    np.cumsum(sat[1:, 1:], axis=1, out=sat[1:, 1:])
+
+    top = slice(0, tile_h * sy, sy)
+    bottom = slice(kH, kH + tile_h * sy, sy)
+    left = slice(0, tile_w * sx, sx)
+    right = slice(kW, kW + tile_w * sx, sx)
+    window = sat[bottom, right] - sat[top, right] - sat[bottom, left] + sat[top, left]
+    out[i0:i1, j0:j1] = window * weight
+
+
+def _convolve_block_gray_fft(
+    padded: np.ndarray, out: np.ndarray,
+    i0: int, i1: int, j0: int, j1: int,
+    sy: int, sx: int,
+    k2d: np.ndarray
+) -> None:
+    kH, kW = k2d.shape
+    tile_h = i1 - i0
+    tile_w = j1 - j0
+
+    r_start, c_start = i0 * sy, j0 * sx
+    R = (i1 - 1) * sy + kH - r_start
+    C = (j1 - 1) * sx + kW - c_start
+    fh = cv2.getOptimalDFTSize(R)
+    fw = cv2.getOptimalDFTSize(C)
+
+    block = padded[r_start:r_start + R, c_start:c_start + C].astype(np.float64)
+    spec = np.fft.rfft2(block, s=(fh, fw))
+    spec *= np.fft.rfft2(k2d[::-1, ::-1].astype(np.float64), s=(fh, fw))
+    full = np.fft.irfft2(spec, s=(fh, fw))
+
+    valid = full[kH - 1:R:sy, kW - 1:C:sx]
+    out[i0:i1, j0:j1] = valid[:tile_h, :tile_w]
+
+
+def _select_backend(
+    k2d: np.ndarray,
+    is_sep: bool,
+    is_integer: bool,
+    rank: int,
+    stride: Tuple[int, int]
+) -> str:
+    if _is_box_kernel(k2d):
+        return "box"
+    sy, sx = stride
+    kH, kW = k2d.shape
+    taps = int(np.count_nonzero(k2d))
+    if is_integer and taps <= FFT_BREAK_EVEN_TAPS * sy * sx:
+        return "integer"
+    if is_sep:
+        return "separable"
+    if 0 < rank and rank * (kH + kW) < min(taps, FFT_BREAK_EVEN_TAPS * sy * sx):
+        return "lowrank"
+    if taps >= FFT_BREAK_EVEN_TAPS * sy * sx:
+        return "fft"
+    return "direct"
+
+
+def _is_box_kernel(k2d: np.ndarray) -> bool:
+    w = k2d.flat[0]
+    return bool(w != 0.0 and np.all(k2d == w))
+
+
+def _integer_accumulator(k2d: np.ndarray, dtype: np.dtype) -> np.dtype | None:
+    if dtype != np.uint8 or not np.all(k2d == np.round(k2d)):
+        return None
+    bound = 255 * int(np.abs(k2d).sum())
+    if bound <= np.iinfo(np.int16).max:
+        return np.dtype(np.int16)
+    if bound <= INTEGER_EXACT_LIMIT:
+        return np.dtype(np.int32)
+    return None
+
+
+def _is_multichannel_gray(image: np.ndarray) -> bool:
+    if image.ndim != 3 or image.shape[2] < 2:
         return False
-    diff_var = np.var(image_f32[..., 0] - image_f32[..., 1])
+    diff_var = np.var(image[..., 0].astype(np.float32) - image[..., 1])
     return diff_var < 1e-8  # type: ignore
 
 
-def _to_gray_f32(image_f32: np.ndarray) -> np.ndarray:
-    if image_f32.ndim == 2:
-        return image_f32.astype(np.float32, copy=False)
-    h, w, c = image_f32.shape
-    if c == 1 or _is_multichannel_gray(image_f32):
-        return image_f32[..., 0].astype(np.float32, copy=False)
-    return cv2.cvtColor(image_f32, cv2.COLOR_BGR2GRAY).astype(np.float32, copy=False)
+def _to_gray(image: np.ndarray) -> np.ndarray:
+    if image.ndim == 2:
+        return image
+    h, w, c = image.shape
+    if c == 1 or _is_multichannel_gray(image):
+        return image[..., 0]
+    return cv2.cvtColor(image.astype(np.float32, copy=False), cv2.COLOR_BGR2GRAY)
 
 
 def _try_factor_separable(
@@ -192,12 +376,163 @@ def _try_factor_separable(
     return False, np.empty(0, np.float32), np.empty(0, np.float32)
 
 
+def _convolve_opencv(
+    proc: np.ndarray,
+    k: np.ndarray,
+    is_sep: bool,
+    ky: np.ndarray,
+    kx: np.ndarray,
+    sy: int,
+    sx: int,
+    pad_mode: str
+) -> np.ndarray:
+    root.status_details.set(root.current_lang.get("status_details_calc_execution").get())
+    kH, kW = k.shape
+    out_h, out_w = border.output_shape(proc.shape[:2], (kH, kW), (sy, sx), pad_mode)
+    oh, ow = border.origin((kH, kW), pad_mode)
+    r0, c0 = kH // 2 - oh, kW // 2 - ow
+    proc = np.ascontiguousarray(proc, dtype=proc.dtype if proc.dtype == np.uint8 else np.float32)
+    if pad_mode == "wrap":
+        proc = cv2.copyMakeBorder(proc, kH // 2, kH // 2, kW // 2, kW // 2, cv2.BORDER_WRAP)
+        r0, c0 = r0 + kH // 2, c0 + kW // 2
+    border_type = border.CV2_BORDERS.get(pad_mode, cv2.BORDER_CONSTANT)
+    if is_sep:
+        full = cv2.sepFilter2D(proc, cv2.CV_32F, kx, ky, borderType=border_type)
+    else:
+        full = cv2.filter2D(proc, cv2.CV_32F, k, borderType=border_type)
+    root.status_details.set(root.current_lang.get("status_details_tile_done").get())
+    return np.ascontiguousarray(full[r0:r0 + out_h * sy:sy, c0:c0 + out_w * sx:sx], dtype=np.float32)
+
+
+def _convolve_tiled(
+    proc: np.ndarray,
+    k: np.ndarray,
+    ky: np.ndarray,
+    kx: np.ndarray,
+    kys: np.ndarray,
+    kxs: np.ndarray,
+    backend: str,
+    sy: int,
+    sx: int,
+    channels: int,
+    plan: tiling.Tile_Plan,
+    policy: execution.Execution_Policy,
+    pad_mode: str,
+    cancel_token: int | None
+) -> np.ndarray:
+    kH, kW = k.shape
+    out_h, out_w = border.output_shape(proc.shape[:2], (kH, kW), (sy, sx), pad_mode)
+    if channels == 1:
+        src = proc
+        out_shape: Tuple[int, ...] = (out_h, out_w)
+    else:
+        src = np.moveaxis(proc[..., :channels], 2, 0)
+        out_shape = (out_h, out_w, channels)
+
+    acc_dtype = _integer_accumulator(k, proc.dtype) if backend == "integer" else None
+    in_dtype = np.dtype(np.uint8 if acc_dtype is not None else np.float32)
+    root.status_details.set(root.current_lang.get("status_details_set_shared_memory").get())
+    buffer_in = execution.share(policy, src, in_dtype)
+
+    root.status_details.set(root.current_lang.get("status_details_set_shared_memory").get())
+    buffer_out = execution.allocate(policy, out_shape, acc_dtype if acc_dtype is not None else np.float32)
+
+    root.status_details.set(root.current_lang.get("status_details_set_tile_splitting").get())
+    tiles = tiling.split((out_h, out_w), plan, channels)
+
+    root.status_details.set(root.current_lang.get("status_details_start_execution").get())
+    try:
+        if backend == "separable":
+            block, block_args = _convolve_block_gray_separable, (_fold_taps(ky[:, None], FOLD_TOLERANCE), _fold_taps(kx[None, :], FOLD_TOLERANCE))
+        elif backend == "box":
+            block, block_args = _convolve_block_gray_box, ((kH, kW, float(k[0, 0])),)
+        elif backend == "lowrank":
+            block, block_args = _convolve_block_gray_lowrank, (kys, kxs)
+        elif backend == "fft":
+            block, block_args = _convolve_block_gray_fft, (k,)
+        elif backend == "integer":
+            integer_taps = [(dy, dx, my, mx, int(w), sign) for dy, dx, my, mx, w, sign in _fold_taps(k)]
+            block, block_args = _convolve_block_gray_integer, (integer_taps,)
+        else:
+            block, block_args = _convolve_block_gray, (_fold_taps(k),)
+        root.status_details.set(root.current_lang.get("status_details_calc_execution").get())
+        execution.run(policy, _convolve_tile, (buffer_in, buffer_out), tiles, (block, block_args, (sy, sx), channels, (kH, kW), pad_mode, in_dtype), cancel_token)
+        root.status_details.set(root.current_lang.get("status_details_tile_done").get())
+    except BaseException:
+        execution.discard(buffer_in)
+        execution.discard(buffer_out)
+        raise
+    finally:
+        root.status_details.set(root.current_lang.get("status_details_unload_shared_memory").get())
+        execution.release(buffer_in)
+    return execution.result(buffer_out)
+
+
+def _plan_tiles(
+    backend: str,
+    out_hw: Tuple[int, int],
+    stride: Tuple[int, int],
+    k_shape: Tuple[int, int],
+    rank: int,
+    workers: int
+) -> tiling.Tile_Plan:
+    if TILE_SIZE is not None:
+        return tiling.fixed_plan("default/" + backend, out_hw, TILE_SIZE, workers)
+    if backend == "fft":
+        return tiling.plan_tiles("default/fft", out_hw, stride, k_shape, workers, in_bytes=36, work_bytes=4, cache_level=3)
+    if backend == "box":
+        return tiling.plan_tiles("default/box", out_hw, stride, k_shape, workers, in_bytes=12, work_bytes=8)
+    if backend == "integer":
+        return tiling.plan_tiles("default/integer", out_hw, stride, k_shape, workers, in_bytes=1, work_bytes=8)
+    if backend in ("separable", "lowrank"):
+        return tiling.plan_tiles("default/" + backend, out_hw, stride, k_shape, workers, work_bytes=4 * (max(1, rank) * stride[0] + 3))
+    return tiling.plan_tiles("default/direct", out_hw, stride, k_shape, workers)
+
+
+def _suppress_border(result: np.ndarray, border_h: int, border_w: int) -> None:
+    if border_h > 0:
+        result[:border_h] = 0
+        result[-border_h:] = 0
+    if border_w > 0:
+        result[:, :border_w] = 0
+        result[:, -border_w:] = 0
+
+
+def _try_factor_low_rank(
+    k2d: np.ndarray,
+    tol_rel: float = LOW_RANK_TOLERANCE
+) -> tuple[int, np.ndarray, np.ndarray]:
+    k = np.asarray(k2d, dtype=np.float64)
+    kH, kW = k.shape
+    base = np.linalg.norm(k, ord="fro")
+    if base == 0.0:
+        return 0, np.empty((0, kH), np.float32), np.empty((0, kW), np.float32)
+
+    U, s, VT = np.linalg.svd(k, full_matrices=False)
+    tail = np.sqrt(np.cumsum((s ** 2)[::-1])[::-1])
+    rank = s.size
+    for r in range(1, s.size):
+        if tail[r] / base <= tol_rel:
+            rank = r
+            break
+    root_s = np.sqrt(s[:rank])
+    kys = (U[:, :rank] * root_s[None, :]).T.astype(np.float32)
+    kxs = (VT[:rank, :] * root_s[:, None]).astype(np.float32)
+    return rank, kys, kxs
+
+
 def default(
     image: npt.NDArray,
     kernel: list[list[float]],
     stride: Tuple[int, int] = (1, 1),
     edge_filter: bool = False,
-    use_conv_scale: bool = True
+    use_conv_scale: bool = True,
+    engine_stats: dict[str, Any] | None = None,
+    force_channels: int | None = None,
+    force_backend: str | None = None,
+    suppress_border: bool | None = None,
+    pad_mode: str = "constant",
+    cancel_token: int | None = None
 ) -> npt.NDArray:
     assert root.status_details is not None
 
@@ -214,122 +549,70 @@ def default(
     if (kH % 2 == 0) or (kW % 2 == 0):
         log.log.write(text=Error.CONVOLUTION_KERNAL_DIMENSION_EVEN.value, tag="CRITICAL ERROR", modulename=Path(__file__).stem)
     kh, kw = kH // 2, kW // 2
+    border.check(pad_mode)
 
     root.status_details.set(root.current_lang.get("status_details_checking_image_datatype").get())
     if not (np.issubdtype(image.dtype, np.integer) or np.issubdtype(image.dtype, np.floating)):
         log.log.write(text=Error.CONVOLUTION_IMAGE_DATA_TYPE.value, tag="CRITICAL ERROR", modulename=Path(__file__).stem)
-    image_f32 = image.astype(np.float32, copy=False)
 
     root.status_details.set(root.current_lang.get("status_details_checking_gray_monochrom").get())
-    force_gray = (edge_filter or (image_f32.ndim == 2) or _is_multichannel_gray(image_f32) or (image_f32.ndim == 3 and image_f32.shape[2] in (1, 2)))
+    if force_channels is not None:
+        force_gray = force_channels == 1
+    else:
+        force_gray = (edge_filter or (image.ndim == 2) or _is_multichannel_gray(image) or (image.ndim == 3 and image.shape[2] in (1, 2)))
     if force_gray:
-        proc = _to_gray_f32(image_f32)
+        proc = _to_gray(image)
         channels = 1
     else:
-        proc = image_f32 if image_f32.ndim == 3 else np.repeat(image_f32[..., None], 3, axis=2)
+        proc = image
         channels = 3
 
     root.status_details.set(root.current_lang.get("status_details_checking_kernal_separable").get())
     is_sep, ky, kx = _try_factor_separable(k, tol_rel=1e-6)
-
-    root.status_details.set(root.current_lang.get("status_details_set_padding").get())
-    if channels == 1:
-        padded = np.pad(proc, ((kh, kh), (kw, kw)), mode="constant", constant_values=0.0)
-        H, W = proc.shape
-        out_h, out_w = (H + sy - 1) // sy, (W + sx - 1) // sx
-        out_shape = (out_h, out_w)
-        in_shape = padded.shape
+    rank, kys, kxs = (1, ky[None, :], kx[None, :]) if is_sep else _try_factor_low_rank(k)
+
+    acc_dtype = _integer_accumulator(k, proc.dtype)
+
+    root.status_details.set(root.current_lang.get("status_details_select_backend").get())
+    H, W = proc.shape[:2]
+    out_h, out_w = border.output_shape((H, W), (kH, kW), (sy, sx), pad_mode)
+    workers = pool.worker_count()
+    plan = _plan_tiles("direct", (out_h, out_w), (sy, sx), (kH, kW), rank, workers)
+    if force_backend is not None:
+        backend, predicted_time, predictions = force_backend, -1.0, {}
+    elif AUTOTUNE:
+        backend, predicted_time, predictions = autotune.select_backend(k, is_sep, _is_box_kernel(k), acc_dtype is not None, rank, (out_h, out_w), (sy, sx), channels, (plan["tile_h"], plan["tile_w"]), workers)
     else:
-        padded = np.pad(proc, ((kh, kh), (kw, kw), (0, 0)), mode="constant", constant_values=0.0)
-        H, W, _ = proc.shape
-        out_h, out_w = (H + sy - 1) // sy, (W + sx - 1) // sx
-        out_shape = (out_h, out_w, 3)
-        in_shape = padded.shape
-
-    padded = np.asarray(padded, dtype=np.float32, copy=False)
-
-    root.status_details.set(root.current_lang.get("status_details_set_shared_memory").get())
-    shm_in = shared_memory.SharedMemory(create=True, size=padded.nbytes)
-    buf_in = np.ndarray(in_shape, dtype=np.float32, buffer=shm_in.buf)
-    root.status_details.set(root.current_lang.get("status_details_load_image_shared_memory").get())
-    np.copyto(buf_in, padded, casting="no")
-
-    root.status_details.set(root.current_lang.get("status_details_set_shared_memory").get())
-    n_out = int(np.prod(out_shape, dtype=np.int64))
-    shm_out = shared_memory.SharedMemory(create=True, size=n_out * np.dtype(np.float32).itemsize)
-    buf_out = np.ndarray(out_shape, dtype=np.float32, buffer=shm_out.buf)
-
-    root.status_details.set(root.current_lang.get("status_details_set_tile_splitting").get())
-    tiles: List[Tuple[int, int, int, int]] = []
-    for i0_ in range(0, out_h, TILE_SIZE):
-        i1_ = min(i0_ + TILE_SIZE, out_h)
-        for j0_ in range(0, out_w, TILE_SIZE):
-            j1_ = min(j0_ + TILE_SIZE, out_w)
-            tiles.append((i0_, i1_, j0_, j1_))
+        backend, predicted_time, predictions = _select_backend(k, is_sep, acc_dtype is not None, rank, (sy, sx)), -1.0, {}
 
-    root.status_details.set(root.current_lang.get("status_details_checking_number_worker").get())
-    cpu = os.cpu_count() or 2
-    max_workers = max(1, cpu - max(1, KEEP_FREE_CORES))
-
-    root.status_details.set(root.current_lang.get("status_details_start_execution").get())
-    try:
-        if is_sep:
-            with ProcessPoolExecutor(max_workers=max_workers) as ex:
-                futures = [
-                    ex.submit(
-                        _worker_convolve_tile_separable,
-                        shm_in.name, in_shape,
-                        shm_out.name, out_shape,
-                        tile_ij, ky, kx, (sy, sx), channels
-                    )
-                    for tile_ij in tiles
-                ]
-                root.status_details.set(root.current_lang.get("status_details_calc_execution").get())
-                for f in as_completed(futures):
-                    f.result()
-                root.status_details.set(root.current_lang.get("status_details_tile_done").get())
-        else:
-            kernel_positions: List[Tuple[int, int, float]] = [(dy, dx, float(k[dy, dx])) for dy in range(kH) for dx in range(kW) if k[dy, dx] != 0.0]
-            with ProcessPoolExecutor(max_workers=max_workers) as ex:
-                futures = [
-                    ex.submit(
-                        _worker_convolve_tile,
-                        shm_in.name, in_shape,
-                        shm_out.name, out_shape,
-                        tile_ij, kernel_positions, (sy, sx), channels
-                    )
-                    for tile_ij in tiles
-                ]
-                root.status_details.set(root.current_lang.get("status_details_calc_execution").get())
-                for f in as_completed(futures):
-                    f.result()
-                root.status_details.set(root.current_lang.get("status_details_tile_done").get())
-
-        result_f32 = buf_out.copy().astype(np.float32, copy=False)
-    finally:
-        root.status_details.set(root.current_lang.get("status_details_unload_shared_memory").get())
-        shm_in.close()
-        shm_in.unlink()
-        shm_out.close()
-        shm_out.unlink()
-
-    if SUPPRESS_PADDING_BORDER:
-        border_h, border_w = kh, kw
-        if border_h > 0 or border_w > 0:
-            if result_f32.ndim == 2:
-                if border_h > 0:
-                    result_f32[:border_h, :] = 0.0
-                    result_f32[-border_h:, :] = 0.0
-                if border_w > 0:
-                    result_f32[:, :border_w] = 0.0
-                    result_f32[:, -border_w:] = 0.0
-            else:
-                if border_h > 0:
-                    result_f32[:border_h, :, :] = 0.0
-                    result_f32[-border_h:, :, :] = 0.0
-                if border_w > 0:
-                    result_f32[:, :border_w, :] = 0.0
-                    result_f32[:, -border_w:, :] = 0.0
+    start_time = time.perf_counter()
+    policy: execution.Execution_Policy | None = None
+    if backend == "opencv":
+        execution.check(cancel_token)
+        result_f32 = _convolve_opencv(proc, k, is_sep, ky, kx, sy, sx, pad_mode)
+    else:
+        if backend != "direct":
+            plan = _plan_tiles(backend, (out_h, out_w), (sy, sx), (kH, kW), rank, workers)
+        tiling.plan_channels(plan, channels)
+        tiling.report(plan)
+        work = autotune.work_units(backend, (kH, kW), int(np.count_nonzero(k)), (out_h, out_w), (sy, sx), channels, (plan["tile_h"], plan["tile_w"]), rank)
+        policy = execution.choose(work, plan["n_tiles"], workers)
+        result_f32 = _convolve_tiled(proc, k, ky, kx, kys, kxs, backend, sy, sx, channels, plan, policy, pad_mode, cancel_token)
+        if backend == "integer" and not (channels == 1 and use_conv_scale):
+            result_f32 = result_f32.astype(np.float32)
+    if engine_stats is not None:
+        engine_stats["backend"] = backend
+        engine_stats["rank"] = rank
+        engine_stats["symmetry"] = _kernel_symmetry(k)
+        engine_stats["accumulator"] = str(acc_dtype) if backend == "integer" else "float32"
+        engine_stats["predicted_time"] = predicted_time
+        engine_stats["actual_time"] = time.perf_counter() - start_time
+        engine_stats["predictions"] = predictions
+        engine_stats["tile_plan"] = plan if backend != "opencv" else None
+        engine_stats["execution"] = policy
+
+    if pad_mode != "valid" and (SUPPRESS_PADDING_BORDER if suppress_border is None else suppress_border):
+        _suppress_border(result_f32, kh, kw)
 
     if channels == 1:
         if use_conv_scale:
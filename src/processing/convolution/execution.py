@@ -0,0 +1,266 @@
+import time
+import pickle
+import itertools
+from typing import Any, Callable, Iterator, Literal, Sequence, Tuple
+from concurrent.futures import FIRST_COMPLETED, wait
+from multiprocessing import shared_memory
+from typing_extensions import TypedDict
+import numpy as np
+import src.processing.convolution.pool as pool
+import src.processing.convolution.shared_buffer as shared_buffer
+
+
+Execution_Mode = Literal["inline", "thread", "process"]
+
+INLINE_MAX_WORK: float = 4.0e6
+THREAD_MAX_WORK: float = 2.0e8
+FORCE_MODE: Execution_Mode | None = None
+PROGRESS_INTERVAL: float = 0.05
+CHUNKS_PER_WORKER: int = 2
+IN_FLIGHT_PER_WORKER: int = 2
+
+Buffer = Tuple[shared_memory.SharedMemory | None, np.ndarray]
+Progress_Callback = Callable[[int, int], None]
+Tile = Tuple[int, ...]
+Job_Ref = Tuple[str, int, int]
+
+_progress: Progress_Callback | None = None
+_job_ids = itertools.count()
+_job_cache: Tuple[Tuple[str, int], Callable[..., None], Tuple[Any, ...]] | None = None
+
+
+class Cancelled(Exception):
+    pass
+
+
+class Execution_Policy(TypedDict):
+    mode: Execution_Mode
+    work: float
+    n_tiles: int
+    workers: int
+    inline_max_work: float
+    thread_max_work: float
+
+
+def token() -> int:
+    return pool.generation()
+
+
+def cancel() -> None:
+    pool.cancel()
+
+
+def cancelled(cancel_token: int | None) -> bool:
+    return cancel_token is not None and cancel_token != pool.generation()
+
+
+def check(cancel_token: int | None) -> None:
+    if cancelled(cancel_token):
+        raise Cancelled()
+
+
+def set_progress(callback: Progress_Callback | None) -> None:
+    global _progress
+    _progress = callback
+
+
+def get_progress() -> Progress_Callback | None:
+    return _progress
+
+
+def _report(done: int, total: int, last: float) -> float:
+    now = time.perf_counter()
+    if _progress is not None and (done == total or now - last >= PROGRESS_INTERVAL):
+        _progress(done, total)
+        return now
+    return last
+
+
+def choose(work: float, n_tiles: int, workers: int | None = None) -> Execution_Policy:
+    if workers is None:
+        workers = pool.worker_count()
+    mode: Execution_Mode
+    if FORCE_MODE is not None:
+        mode = FORCE_MODE
+    elif work <= INLINE_MAX_WORK or n_tiles <= 1 or workers <= 1:
+        mode = "inline"
+    elif work <= THREAD_MAX_WORK:
+        mode = "thread"
+    else:
+        mode = "process"
+    return {
+        "mode": mode,
+        "work": float(work),
+        "n_tiles": n_tiles,
+        "workers": workers,
+        "inline_max_work": INLINE_MAX_WORK,
+        "thread_max_work": THREAD_MAX_WORK
+    }
+
+
+def allocate(policy: Execution_Policy, shape: Tuple[int, ...], dtype: np.dtype | type) -> Buffer:
+    if policy["mode"] == "process":
+        return shared_buffer.create(shape, dtype)
+    return None, np.empty(shape, dtype=dtype)
+
+
+def share(policy: Execution_Policy, array: np.ndarray, dtype: np.dtype | type | None = None) -> Buffer:
+    if policy["mode"] != "process":
+        return None, array
+    shm, shared = shared_buffer.create(array.shape, array.dtype if dtype is None else dtype)
+    np.copyto(shared, array, casting="unsafe")
+    return shm, shared
+
+
+def release(buffer: Buffer | None) -> None:
+    if buffer is not None and buffer[0] is not None:
+        shared_buffer.release(buffer[0])
+
+
+def discard(buffer: Buffer | None) -> None:
+    if buffer is not None and buffer[0] is not None:
+        shared_buffer.discard(buffer[0])
+
+
+def result(buffer: Buffer) -> np.ndarray:
+    shm, array = buffer
+    if shm is None:
+        return array
+    return shared_buffer.detach(shm, array.shape, array.dtype)
+
+
+def _tile_cost(tile: Tile) -> int:
+    cost = (tile[1] - tile[0]) * (tile[3] - tile[2])
+    return cost * (tile[5] - tile[4]) if len(tile) == 6 else cost
+
+
+def chunks(tiles: Sequence[Tile], workers: int) -> Iterator[list[Tile]]:
+    costs = [_tile_cost(t) for t in tiles]
+    remaining = sum(costs)
+    chunk: list[Tile] = []
+    chunk_cost, target = 0, remaining / max(1, CHUNKS_PER_WORKER * workers)
+    for tile, cost in zip(tiles, costs):
+        chunk.append(tile)
+        chunk_cost += cost
+        if chunk_cost >= target:
+            yield chunk
+            remaining -= chunk_cost
+            chunk, chunk_cost = [], 0
+            target = remaining / max(1, CHUNKS_PER_WORKER * workers)
+    if chunk:
+        yield chunk
+
+
+def _publish_job(fn: Callable[..., None], args: Tuple[Any, ...]) -> Tuple[Buffer, Job_Ref]:
+    payload = pickle.dumps((fn, args), protocol=pickle.HIGHEST_PROTOCOL)
+    shm, block = shared_buffer.create((len(payload),), np.uint8)
+    block[:] = np.frombuffer(payload, dtype=np.uint8)
+    return (shm, block), (shm.name, next(_job_ids), len(payload))
+
+
+def _load_job(job: Job_Ref) -> Tuple[Callable[..., None], Tuple[Any, ...]]:
+    global _job_cache
+    name, job_id, size = job
+    if _job_cache is None or _job_cache[0] != (name, job_id):
+        shm = shared_memory.SharedMemory(name=name)
+        try:
+            fn, args = pickle.loads(bytes(shm.buf[:size]))
+        finally:
+            shm.close()
+        _job_cache = ((name, job_id), fn, args)
+    return _job_cache[1], _job_cache[2]
+
+
+def _guarded_chunk(
+    fn: Callable[..., None],
+    arrays: Sequence[np.ndarray | None],
+    chunk: Sequence[Tile],
+    args: Tuple[Any, ...],
+    cancel_token: int | None
+) -> int:
+    for tile_ij in chunk:
+        if cancelled(cancel_token):
+            break
+        fn(*arrays, tile_ij, *args)
+    return len(chunk)
+
+
+def _worker_chunk(
+    job: Job_Ref,
+    specs: Sequence[Tuple[str, Tuple[int, ...], str] | None],
+    chunk: Sequence[Tile],
+    cancel_token: int | None
+) -> int:
+    if cancelled(cancel_token):
+        return len(chunk)
+    fn, args = _load_job(job)
+    handles: list[shared_memory.SharedMemory] = []
+    arrays: list[np.ndarray | None] = []
+    try:
+        for spec in specs:
+            if spec is None:
+                arrays.append(None)
+                continue
+            name, shape, dtype = spec
+            shm = shared_memory.SharedMemory(name=name)
+            handles.append(shm)
+            arrays.append(np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf))
+        return _guarded_chunk(fn, arrays, chunk, args, cancel_token)
+    finally:
+        arrays.clear()
+        for shm in handles:
+            shm.close()
+
+
+def run(
+    policy: Execution_Policy,
+    fn: Callable[..., None],
+    buffers: Sequence[Buffer | None],
+    tiles: Sequence[Tile],
+    args: Tuple[Any, ...],
+    cancel_token: int | None = None
+) -> None:
+    check(cancel_token)
+    total, last = len(tiles), 0.0
+    if policy["mode"] == "inline":
+        arrays = [b[1] if b is not None else None for b in buffers]
+        for done, tile_ij in enumerate(tiles, 1):
+            fn(*arrays, tile_ij, *args)
+            check(cancel_token)
+            last = _report(done, total, last)
+        return
+    job_block: Buffer | None = None
+    if policy["mode"] == "thread":
+        arrays = [b[1] if b is not None else None for b in buffers]
+        ex = pool.get_thread_executor()
+
+        def submit(chunk: list[Tile]) -> Any:
+            return ex.submit(_guarded_chunk, fn, arrays, chunk, args, cancel_token)
+    else:
+        specs = [(b[0].name, b[1].shape, b[1].dtype.str) if b is not None and b[0] is not None else None for b in buffers]
+        pex = pool.get_executor()
+        job_block, job = _publish_job(fn, args)
+
+        def submit(chunk: list[Tile]) -> Any:
+            return pex.submit(_worker_chunk, job, specs, chunk, cancel_token)
+    pending: set = set()
+    try:
+        queue = chunks(tiles, policy["workers"])
+        limit = max(1, policy["workers"] if policy["workers"] < pool.size(policy["mode"] == "thread") else IN_FLIGHT_PER_WORKER * policy["workers"])
+        done = 0
+        for chunk in itertools.islice(queue, limit):
+            pending.add(submit(chunk))
+        while pending:
+            finished, pending = wait(pending, timeout=PROGRESS_INTERVAL, return_when=FIRST_COMPLETED)
+            for f in finished:
+                done += f.result()
+            check(cancel_token)
+            for chunk in itertools.islice(queue, len(finished)):
+                pending.add(submit(chunk))
+            last = _report(done, total, last)
+    except BaseException:
+        for f in pending:
+            f.cancel()
+        discard(job_block)
+        raise
+    release(job_block)
@@ -0,0 +1,177 @@
+from typing import Tuple, List
+import numpy as np
+import numpy.typing as npt
+from src.gui.state.error import Error
+from src.gui.state import root
+import src.gui.utils.logger as log
+from pathlib import Path
+import src.processing.convolution.pool as pool
+import src.processing.convolution.shared_buffer as shared_buffer
+import src.processing.convolution.tiling as tiling
+import src.processing.convolution.execution as execution
+from src.processing.convolution.default import _to_gray
+
+
+TILE_SIZE: int | None = None
+
+Bank_Positions = List[Tuple[int, int, List[Tuple[int, float]]]]
+
+
+def compass_kernels(base: list[list[float]], directions: int = 8) -> List[np.ndarray]:
+    k = np.asarray(base, dtype=np.float32)
+    n = k.shape[0]
+    if k.ndim != 2 or n != k.shape[1] or n % 2 == 0:
+        log.log.write(text=Error.CONVOLUTION_KERNAL_DIMENSION.value, tag="CRITICAL ERROR", modulename=Path(__file__).stem)
+    rings: List[List[Tuple[int, int]]] = []
+    for r in range(n // 2):
+        a, b = r, n - 1 - r
+        ring = [(a, x) for x in range(a, b)] + [(y, b) for y in range(a, b)] + [(b, x) for x in range(b, a, -1)] + [(y, a) for y in range(b, a, -1)]
+        rings.append(ring)
+    kernels: List[np.ndarray] = []
+    for d in range(directions):
+        kd = k.copy()
+        for ring in rings:
+            step = d * len(ring) // directions
+            values = [k[p] for p in ring]
+            for idx, p in enumerate(ring):
+                kd[p] = values[(idx + step) % len(ring)]
+        kernels.append(kd)
+    return kernels
+
+
+def _stack_kernels(kernels: List[np.ndarray]) -> np.ndarray:
+    kH = max(int(k.shape[0]) for k in kernels)
+    kW = max(int(k.shape[1]) for k in kernels)
+    bank = np.zeros((len(kernels), kH, kW), dtype=np.float32)
+    for n, k in enumerate(kernels):
+        oy, ox = (kH - k.shape[0]) // 2, (kW - k.shape[1]) // 2
+        bank[n, oy:oy + k.shape[0], ox:ox + k.shape[1]] = k
+    return bank
+
+
+def _bank_positions(bank: np.ndarray) -> Bank_Positions:
+    _, kH, kW = bank.shape
+    positions: Bank_Positions = []
+    for dy in range(kH):
+        for dx in range(kW):
+            weights = [(n, float(w)) for n, w in enumerate(bank[:, dy, dx]) if w != 0.0]
+            if weights:
+                positions.append((dy, dx, weights))
+    return positions
+
+
+def _filter_bank_block(
+    padded: np.ndarray,
+    i0: int,
+    i1: int,
+    j0: int,
+    j1: int,
+    sy: int,
+    sx: int,
+    k_shape: Tuple[int, int],
+    positions: Bank_Positions,
+    n_kernels: int
+) -> np.ndarray:
+    kH, kW = k_shape
+    tile_h, tile_w = i1 - i0, j1 - j0
+    slab = np.ascontiguousarray(padded[i0 * sy:(i1 - 1) * sy + kH, j0 * sx:(j1 - 1) * sx + kW])
+    acc = np.zeros((n_kernels, tile_h, tile_w), dtype=np.float32)
+    tmp = np.empty((tile_h, tile_w), dtype=np.float32)
+    for dy, dx, weights in positions:
+        view = slab[dy:dy + (tile_h - 1) * sy + 1:sy, dx:dx + (tile_w - 1) * sx + 1:sx]
+        for n, w in weights:
+            np.multiply(view, w, out=tmp)
+            np.add(acc[n], tmp, out=acc[n])
+    return acc
+
+
+def _filter_bank_tile(
+    padded: np.ndarray,
+    out: np.ndarray,
+    arg: np.ndarray | None,
+    tile_ij: Tuple[int, int, int, int],
+    k_shape: Tuple[int, int],
+    positions: Bank_Positions,
+    n_kernels: int,
+    stride: Tuple[int, int]
+) -> None:
+    sy, sx = stride
+    i0, i1, j0, j1 = tile_ij
+    acc = _filter_bank_block(padded, i0, i1, j0, j1, sy, sx, k_shape, positions, n_kernels)
+    if arg is None:
+        out[:, i0:i1, j0:j1] = acc
+    else:
+        idx = np.argmax(acc, axis=0)
+        out[i0:i1, j0:j1] = np.take_along_axis(acc, idx[None], axis=0)[0]
+        arg[i0:i1, j0:j1] = idx
+
+
+def filter_bank(
+    image: npt.NDArray,
+    kernels: List[np.ndarray] | List[list[list[float]]],
+    stride: Tuple[int, int] = (1, 1),
+    reduce: bool = True
+) -> Tuple[npt.NDArray[np.float32], npt.NDArray[np.uint8] | None]:
+    assert root.status_details is not None
+
+    root.status_details.set(root.current_lang.get("status_details_checking_sample_rate").get())
+    sy, sx = stride
+    if sy < 1 or sx < 1:
+        log.log.write(text=Error.CONVOLUTION_NEGATIVE_STRIDE.value, tag="CRITICAL ERROR", modulename=Path(__file__).stem)
+
+    root.status_details.set(root.current_lang.get("status_details_checking_kernal_dimensions").get())
+    ks = [np.asarray(k, dtype=np.float32) for k in kernels]
+    if len(ks) == 0 or len(ks) > 255 or any(k.ndim != 2 for k in ks):
+        log.log.write(text=Error.CONVOLUTION_KERNAL_DIMENSION.value, tag="CRITICAL ERROR", modulename=Path(__file__).stem)
+    if any(k.shape[0] % 2 == 0 or k.shape[1] % 2 == 0 for k in ks):
+        log.log.write(text=Error.CONVOLUTION_KERNAL_DIMENSION_EVEN.value, tag="CRITICAL ERROR", modulename=Path(__file__).stem)
+    bank = _stack_kernels(ks)
+    n_kernels, kH, kW = bank.shape
+    positions = _bank_positions(bank)
+
+    root.status_details.set(root.current_lang.get("status_details_checking_image_datatype").get())
+    if not (np.issubdtype(image.dtype, np.integer) or np.issubdtype(image.dtype, np.floating)):
+        log.log.write(text=Error.CONVOLUTION_IMAGE_DATA_TYPE.value, tag="CRITICAL ERROR", modulename=Path(__file__).stem)
+    root.status_details.set(root.current_lang.get("status_details_checking_gray_monochrom").get())
+    proc = _to_gray(image)
+
+    H, W = proc.shape
+    out_h, out_w = (H + sy - 1) // sy, (W + sx - 1) // sx
+    in_shape = (H + 2 * (kH // 2), W + 2 * (kW // 2))
+    out_shape = (out_h, out_w) if reduce else (n_kernels, out_h, out_w)
+
+    root.status_details.set(root.current_lang.get("status_details_set_tile_splitting").get())
+    workers = pool.worker_count()
+    if TILE_SIZE is not None:
+        plan = tiling.fixed_plan("filter_bank", (out_h, out_w), TILE_SIZE, workers)
+    else:
+        plan = tiling.plan_tiles("filter_bank", (out_h, out_w), (sy, sx), (kH, kW), workers, work_bytes=4 * (n_kernels + 1))
+    tiling.report(plan)
+    tiles = tiling.split((out_h, out_w), plan)
+    policy = execution.choose(float(out_h * out_w * sum(len(w) for _, _, w in positions)), len(tiles), workers)
+
+    root.status_details.set(root.current_lang.get("status_details_set_shared_memory").get())
+    buffer_in = execution.allocate(policy, in_shape, np.float32)
+    buffer_out = execution.allocate(policy, out_shape, np.float32)
+    buffer_arg = execution.allocate(policy, (out_h, out_w), np.uint8) if reduce else None
+    try:
+        root.status_details.set(root.current_lang.get("status_details_set_padding").get())
+        shared_buffer.pad_into(buffer_in[1], proc, kH // 2, kW // 2)
+
+        root.status_details.set(root.current_lang.get("status_details_start_execution").get())
+        root.status_details.set(root.current_lang.get("status_details_calc_execution").get())
+        execution.run(policy, _filter_bank_tile, (buffer_in, buffer_out, buffer_arg), tiles, ((kH, kW), positions, n_kernels, (sy, sx)))
+        root.status_details.set(root.current_lang.get("status_details_tile_done").get())
+    except BaseException:
+        execution.discard(buffer_in)
+        execution.discard(buffer_out)
+        execution.discard(buffer_arg)
+        raise
+    finally:
+        root.status_details.set(root.current_lang.get("status_details_unload_shared_memory").get())
+        execution.release(buffer_in)
+
+    root.status_details.set(root.current_lang.get("status_details_done").get())
+    result = execution.result(buffer_out)
+    orientation = execution.result(buffer_arg) if buffer_arg is not None else None
+    return result, orientation
@@ -0,0 +1,169 @@
+import math
+import time
+import numpy as np
+import numpy.typing as npt
+import cv2
+from typing import Any, Tuple, List
+from src.gui.state import root
+import src.gui.utils.logger as log
+from src.gui.state.error import Error
+from pathlib import Path
+import src.processing.convolution.pool as pool
+import src.processing.convolution.border as border
+import src.processing.convolution.tiling as tiling
+import src.processing.convolution.execution as execution
+
+
+MIN_BAND: int = 64
+IIR_MIN_SIGMA: float = 8.0
+FIR_RADIUS_SIGMAS: float = 4.0
+
+
+Coefficients = Tuple[float, float, float, float, Tuple[Tuple[float, float, float], ...]]
+
+
+def _boundary_matrix(a1: float, a2: float, a3: float, length: int) -> Tuple[Tuple[float, float, float], ...]:
+    rows: List[Tuple[float, float, float]] = []
+    for j in range(3):
+        u = [0.0, 0.0, 0.0]
+        u[2 - j] = 1.0
+        for _ in range(length):
+            u.append(a1 * u[-1] + a2 * u[-2] + a3 * u[-3])
+        v = [0.0, 0.0, 0.0]
+        for n in range(len(u) - 1, 2, -1):
+            v.append((1.0 - a1 - a2 - a3) * u[n] + a1 * v[-1] + a2 * v[-2] + a3 * v[-3])
+        rows.append((v[-1], v[-2], v[-3]))
+    return tuple(zip(*rows))  # type: ignore
+
+
+def _young_van_vliet(sigma: float) -> Coefficients:
+    sigma = max(sigma, 0.5)
+    if sigma >= 2.5:
+        q = 0.98711 * sigma - 0.96330
+    else:
+        q = 3.97156 - 4.14554 * math.sqrt(1.0 - 0.26891 * sigma)
+    b0 = 1.57825 + 2.44413 * q + 1.4281 * q ** 2 + 0.422205 * q ** 3
+    b1 = 2.44413 * q + 2.85619 * q ** 2 + 1.26661 * q ** 3
+    b2 = -(1.4281 * q ** 2 + 1.26661 * q ** 3)
+    b3 = 0.422205 * q ** 3
+    B = 1.0 - (b1 + b2 + b3) / b0
+    a1, a2, a3 = b1 / b0, b2 / b0, b3 / b0
+    return B, a1, a2, a3, _boundary_matrix(a1, a2, a3, int(20 * sigma) + 64)
+
+
+def _iir_axis0(block: np.ndarray, coeffs: Coefficients) -> None:
+    B, a1, a2, a3, M = coeffs
+    n = block.shape[0]
+    last = block[n - 1].copy()
+    w1 = block[0].copy()
+    w2 = w1.copy()
+    w3 = w1.copy()
+    for i in range(n):
+        w = B * block[i] + a1 * w1 + a2 * w2 + a3 * w3
+        block[i] = w
+        w3, w2, w1 = w2, w1, w
+    d = (w1 - last, w2 - last, w3 - last)
+    y1, y2, y3 = (M[r][0] * d[0] + M[r][1] * d[1] + M[r][2] * d[2] + last for r in range(3))
+    for i in range(n - 1, -1, -1):
+        y = B * block[i] + a1 * y1 + a2 * y2 + a3 * y3
+        block[i] = y
+        y3, y2, y1 = y2, y1, y
+
+
+def _gaussian_rows_tile(src: np.ndarray, out: np.ndarray, tile: Tuple[int, ...], coeffs: Coefficients) -> None:
+    r0, r1, c0, c1 = tile
+    block = np.ascontiguousarray(src[r0:r1].transpose(1, 0, 2), dtype=np.float64).reshape(c1 - c0, (r1 - r0) * src.shape[2])
+    _iir_axis0(block, coeffs)
+    out[r0:r1] = block.reshape(c1 - c0, r1 - r0, src.shape[2]).transpose(1, 0, 2)
+
+
+def _gaussian_cols_tile(src: np.ndarray, out: np.ndarray, tile: Tuple[int, ...], coeffs: Coefficients) -> None:
+    r0, r1, c0, c1 = tile
+    block = np.ascontiguousarray(src[:, c0:c1], dtype=np.float64).reshape(r1 - r0, (c1 - c0) * src.shape[2])
+    _iir_axis0(block, coeffs)
+    out[:, c0:c1] = block.reshape(r1 - r0, c1 - c0, src.shape[2])
+
+
+def _gaussian_fir_tile(src: np.ndarray, out: np.ndarray, tile: Tuple[int, ...], kernel: np.ndarray) -> None:
+    r0, r1, c0, c1 = tile
+    r = kernel.shape[0] // 2
+    slab = border.window(src, r0 - r, r1 + r, c0 - r, c1 + r, "edge", np.float32)
+    blurred = cv2.sepFilter2D(slab, cv2.CV_32F, kernel, kernel, borderType=cv2.BORDER_REPLICATE)
+    out[r0:r1, c0:c1] = blurred[r:r + r1 - r0, r:r + c1 - c0].reshape(r1 - r0, c1 - c0, -1)
+
+
+def _bands(n: int, workers: int) -> List[Tuple[int, int]]:
+    size = max(MIN_BAND, math.ceil(n / max(1, workers)))
+    return [(a, min(a + size, n)) for a in range(0, n, size)]
+
+
+def gaussian(
+    image: npt.NDArray,
+    sigma: float,
+    engine_stats: dict[str, Any] | None = None,
+    cancel_token: int | None = None
+) -> npt.NDArray[np.float32]:
+    assert root.status_details is not None
+
+    root.status_details.set(root.current_lang.get("status_details_checking_image_datatype").get())
+    if not (np.issubdtype(image.dtype, np.integer) or np.issubdtype(image.dtype, np.floating)):
+        log.log.write(text=Error.CONVOLUTION_IMAGE_DATA_TYPE.value, tag="CRITICAL ERROR", modulename=Path(__file__).stem)
+    if image.ndim not in (2, 3):
+        log.log.write(text=Error.RESIZE_IMAGE_NDIM.value, tag="CRITICAL ERROR", modulename=Path(__file__).stem)
+    shape3 = image.shape if image.ndim == 3 else (image.shape[0], image.shape[1], 1)
+    H, W, C = shape3
+    recursive = sigma >= IIR_MIN_SIGMA
+
+    root.status_details.set(root.current_lang.get("status_details_checking_number_worker").get())
+    workers = pool.worker_count()
+    root.status_details.set(root.current_lang.get("status_details_set_tile_splitting").get())
+    if recursive:
+        coeffs = _young_van_vliet(float(sigma))
+        passes = [
+            (_gaussian_rows_tile, [(r0, r1, 0, W) for r0, r1 in _bands(H, workers)], coeffs),
+            (_gaussian_cols_tile, [(0, H, c0, c1) for c0, c1 in _bands(W, workers)], coeffs)
+        ]
+        policy = execution.choose(float(H * W * C * 32), len(passes[0][1]) + len(passes[1][1]), workers)
+    else:
+        radius = max(1, int(math.ceil(FIR_RADIUS_SIGMAS * sigma)))
+        kernel = cv2.getGaussianKernel(2 * radius + 1, sigma, cv2.CV_32F)
+        plan = tiling.plan_tiles("gaussian", (H, W), (1, 1), (2 * radius + 1, 2 * radius + 1), workers, in_bytes=4 * C, work_bytes=12 * C)
+        tiling.report(plan)
+        passes = [(_gaussian_fir_tile, tiling.split((H, W), plan), kernel)]
+        policy = execution.choose(float(H * W * C * 2 * (2 * radius + 1)), len(passes[0][1]), workers)
+
+    root.status_details.set(root.current_lang.get("status_details_set_shared_memory").get())
+    buffer_a = execution.allocate(policy, shape3, np.float32) if recursive else execution.share(policy, image.reshape(shape3))
+    buffer_b = execution.allocate(policy, shape3, np.float32)
+    start_time = time.perf_counter()
+    outer = execution.get_progress()
+    total = sum(len(tiles) for _, tiles, _ in passes)
+    try:
+        if recursive:
+            root.status_details.set(root.current_lang.get("status_details_load_image_shared_memory").get())
+            np.copyto(buffer_a[1], image.reshape(shape3), casting="unsafe")
+
+        root.status_details.set(root.current_lang.get("status_details_calc_execution").get())
+        done = 0
+        for i, (fn, tiles, arg) in enumerate(passes):
+            if outer is not None:
+                execution.set_progress(lambda d, _t, base=done: outer(base + d, total))
+            execution.run(policy, fn, (buffer_a, buffer_b) if i % 2 == 0 else (buffer_b, buffer_a), tiles, (arg,), cancel_token)
+            done += len(tiles)
+        root.status_details.set(root.current_lang.get("status_details_tile_done").get())
+    except BaseException:
+        execution.discard(buffer_a)
+        execution.discard(buffer_b)
+        raise
+    finally:
+        execution.set_progress(outer)
+        root.status_details.set(root.current_lang.get("status_details_unload_shared_memory").get())
+    result, spare = (buffer_a, buffer_b) if recursive else (buffer_b, buffer_a)
+    execution.release(spare)
+    if engine_stats is not None:
+        engine_stats["backend"] = "gaussian/iir" if recursive else "gaussian/fir"
+        engine_stats["actual_time"] = time.perf_counter() - start_time
+        engine_stats["execution"] = policy
+
+    root.status_details.set(root.current_lang.get("status_details_done").get())
+    return execution.result(result).reshape(image.shape)
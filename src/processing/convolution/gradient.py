@@ -0,0 +1,223 @@
+import time
+from typing import Any, Tuple, List
+import numpy as np
+import numpy.typing as npt
+import cv2
+from src.gui.state.error import Error
+from src.gui.state import root
+import src.gui.utils.logger as log
+from pathlib import Path
+import src.processing.convolution.pool as pool
+import src.processing.convolution.shared_buffer as shared_buffer
+import src.processing.convolution.tiling as tiling
+import src.processing.convolution.execution as execution
+from src.processing.convolution.default import _to_gray
+
+
+TILE_SIZE: int | None = None
+TAN_22_5: float = 0.41421356
+TAN_67_5: float = 2.41421356
+
+Gradient_Taps = List[Tuple[int, int, int, int, float, float, int]]
+
+
+def _gradient_taps(kx: np.ndarray, ky: np.ndarray) -> Gradient_Taps:
+    kH, kW = kx.shape
+    used = np.zeros((kH, kW), dtype=bool)
+    taps: Gradient_Taps = []
+    for dy in range(kH):
+        for dx in range(kW):
+            wx, wy = float(kx[dy, dx]), float(ky[dy, dx])
+            if used[dy, dx] or (wx == 0.0 and wy == 0.0):
+                continue
+            my, mx = kH - 1 - dy, kW - 1 - dx
+            used[dy, dx] = used[my, mx] = True
+            mwx, mwy = float(kx[my, mx]), float(ky[my, mx])
+            if (my, mx) != (dy, dx) and mwx == wx and mwy == wy:
+                taps.append((dy, dx, my, mx, wx, wy, 1))
+            elif (my, mx) != (dy, dx) and mwx == -wx and mwy == -wy:
+                taps.append((dy, dx, my, mx, wx, wy, -1))
+            else:
+                taps.append((dy, dx, dy, dx, wx, wy, 0))
+                if (my, mx) != (dy, dx) and (mwx != 0.0 or mwy != 0.0):
+                    taps.append((my, mx, my, mx, mwx, mwy, 0))
+    return taps
+
+
+def _accumulate(acc: np.ndarray, src: np.ndarray, w: float, prod: np.ndarray) -> None:
+    if w == 1.0:
+        np.add(acc, src, out=acc)
+    elif w == -1.0:
+        np.subtract(acc, src, out=acc)
+    elif w != 0.0:
+        np.multiply(src, np.float32(w), out=prod)
+        np.add(acc, prod, out=acc)
+
+
+def _gradient_block(
+    padded: np.ndarray,
+    i0: int,
+    i1: int,
+    j0: int,
+    j1: int,
+    sy: int,
+    sx: int,
+    kernels: Tuple[np.ndarray, np.ndarray],
+    taps: Gradient_Taps
+) -> Tuple[np.ndarray, np.ndarray]:
+    tile_h, tile_w = i1 - i0, j1 - j0
+    if sy == 1 and sx == 1:
+        kx, ky = kernels
+        kH, kW = kx.shape
+        slab = padded[i0:i1 + kH - 1, j0:j1 + kW - 1]
+        gx = cv2.filter2D(slab, cv2.CV_32F, kx)[kH // 2:kH // 2 + tile_h, kW // 2:kW // 2 + tile_w]
+        gy = cv2.filter2D(slab, cv2.CV_32F, ky)[kH // 2:kH // 2 + tile_h, kW // 2:kW // 2 + tile_w]
+        return gx, gy
+    gx = np.zeros((tile_h, tile_w), dtype=np.float32)
+    gy = np.zeros((tile_h, tile_w), dtype=np.float32)
+    tmp = np.empty((tile_h, tile_w), dtype=np.float32)
+    prod = np.empty((tile_h, tile_w), dtype=np.float32)
+    for dy, dx, my, mx, wx, wy, sign in taps:
+        view = padded[dy + i0 * sy:dy + i1 * sy:sy, dx + j0 * sx:dx + j1 * sx:sx]
+        if sign == 0:
+            np.copyto(tmp, view, casting="unsafe")
+        else:
+            mirror = padded[my + i0 * sy:my + i1 * sy:sy, mx + j0 * sx:mx + j1 * sx:sx]
+            (np.add if sign > 0 else np.subtract)(view, mirror, out=tmp, dtype=np.float32)
+        _accumulate(gx, tmp, wx, prod)
+        _accumulate(gy, tmp, wy, prod)
+    return gx, gy
+
+
+def _non_maximum_suppression(magnitude: np.ndarray, gx: np.ndarray, gy: np.ndarray) -> np.ndarray:
+    center = magnitude[1:-1, 1:-1]
+    cx, cy = gx[1:-1, 1:-1], gy[1:-1, 1:-1]
+    ax, ay = np.abs(cx), np.abs(cy)
+    horizontal = ay <= TAN_22_5 * ax
+    vertical = ay >= TAN_67_5 * ax
+    rising = (cx > 0) != (cy > 0)
+    falling = ~(horizontal | vertical | rising)
+    rising &= ~(horizontal | vertical)
+
+    keep = horizontal & (center > magnitude[1:-1, :-2]) & (center >= magnitude[1:-1, 2:])
+    keep |= vertical & (center > magnitude[:-2, 1:-1]) & (center >= magnitude[2:, 1:-1])
+    keep |= falling & (center > magnitude[:-2, :-2]) & (center >= magnitude[2:, 2:])
+    keep |= rising & (center > magnitude[:-2, 2:]) & (center >= magnitude[2:, :-2])
+    return keep
+
+
+def _gradient_tile(
+    padded: np.ndarray,
+    magnitude: np.ndarray,
+    orientation: np.ndarray | None,
+    tile_ij: Tuple[int, int, int, int],
+    kernels: Tuple[np.ndarray, np.ndarray],
+    taps: Gradient_Taps,
+    stride: Tuple[int, int],
+    out_hw: Tuple[int, int],
+    nms: bool
+) -> None:
+    sy, sx = stride
+    i0, i1, j0, j1 = tile_ij
+    halo = 1 if nms else 0
+    gx, gy = _gradient_block(padded, i0, i1 + 2 * halo, j0, j1 + 2 * halo, sy, sx, kernels, taps)
+    mag = cv2.magnitude(gx, gy)
+    if nms:
+        out_h, out_w = out_hw
+        if i0 == 0:
+            mag[0] = 0.0
+        if i1 == out_h:
+            mag[-1] = 0.0
+        if j0 == 0:
+            mag[:, 0] = 0.0
+        if j1 == out_w:
+            mag[:, -1] = 0.0
+        keep = _non_maximum_suppression(mag, gx, gy)
+        mag = mag[1:-1, 1:-1] * keep
+        gx, gy = gx[1:-1, 1:-1], gy[1:-1, 1:-1]
+    magnitude[i0:i1, j0:j1] = mag
+    if orientation is not None:
+        orientation[i0:i1, j0:j1] = cv2.phase(np.ascontiguousarray(gx), np.ascontiguousarray(gy), angleInDegrees=True)
+
+
+def gradient(
+    image: npt.NDArray,
+    kernel_x: list[list[float]],
+    kernel_y: list[list[float]] | None = None,
+    stride: Tuple[int, int] = (1, 1),
+    with_orientation: bool = True,
+    nms: bool = False,
+    engine_stats: dict[str, Any] | None = None
+) -> Tuple[npt.NDArray[np.float32], npt.NDArray[np.float32] | None]:
+    assert root.status_details is not None
+
+    root.status_details.set(root.current_lang.get("status_details_checking_sample_rate").get())
+    sy, sx = stride
+    if sy < 1 or sx < 1:
+        log.log.write(text=Error.CONVOLUTION_NEGATIVE_STRIDE.value, tag="CRITICAL ERROR", modulename=Path(__file__).stem)
+
+    root.status_details.set(root.current_lang.get("status_details_checking_kernal_dimensions").get())
+    kx = np.asarray(kernel_x, dtype=np.float32)
+    ky = np.asarray(kernel_y, dtype=np.float32) if kernel_y is not None else np.ascontiguousarray(kx.T)
+    if kx.ndim != 2 or kx.shape != ky.shape:
+        log.log.write(text=Error.CONVOLUTION_KERNAL_DIMENSION.value, tag="CRITICAL ERROR", modulename=Path(__file__).stem)
+    kH, kW = kx.shape
+    if kH % 2 == 0 or kW % 2 == 0:
+        log.log.write(text=Error.CONVOLUTION_KERNAL_DIMENSION_EVEN.value, tag="CRITICAL ERROR", modulename=Path(__file__).stem)
+    taps = _gradient_taps(kx, ky)
+
+    root.status_details.set(root.current_lang.get("status_details_checking_image_datatype").get())
+    if not (np.issubdtype(image.dtype, np.integer) or np.issubdtype(image.dtype, np.floating)):
+        log.log.write(text=Error.CONVOLUTION_IMAGE_DATA_TYPE.value, tag="CRITICAL ERROR", modulename=Path(__file__).stem)
+    root.status_details.set(root.current_lang.get("status_details_checking_gray_monochrom").get())
+    proc = _to_gray(image)
+    in_dtype = np.uint8 if proc.dtype == np.uint8 else np.float32
+
+    H, W = proc.shape
+    out_h, out_w = (H + sy - 1) // sy, (W + sx - 1) // sx
+    halo = 1 if nms else 0
+    pad_h, pad_w = kH // 2 + halo * sy, kW // 2 + halo * sx
+    in_shape = (H + 2 * pad_h, W + 2 * pad_w)
+
+    root.status_details.set(root.current_lang.get("status_details_set_tile_splitting").get())
+    workers = pool.worker_count()
+    if TILE_SIZE is not None:
+        plan = tiling.fixed_plan("gradient", (out_h, out_w), TILE_SIZE, workers)
+    else:
+        plan = tiling.plan_tiles("gradient", (out_h, out_w), (sy, sx), (kH + 2 * halo * sy, kW + 2 * halo * sx), workers, in_bytes=np.dtype(in_dtype).itemsize, work_bytes=28 if with_orientation else 24)
+    tiling.report(plan)
+    tiles = tiling.split((out_h, out_w), plan)
+    policy = execution.choose(float(out_h * out_w * (len(taps) * 3 + (40 if with_orientation else 8))), len(tiles), workers)
+
+    root.status_details.set(root.current_lang.get("status_details_set_shared_memory").get())
+    buffer_in = execution.allocate(policy, in_shape, in_dtype)
+    buffer_mag = execution.allocate(policy, (out_h, out_w), np.float32)
+    buffer_ori = execution.allocate(policy, (out_h, out_w), np.float32) if with_orientation else None
+    start_time = time.perf_counter()
+    try:
+        root.status_details.set(root.current_lang.get("status_details_set_padding").get())
+        shared_buffer.pad_into(buffer_in[1], proc, pad_h, pad_w)
+
+        root.status_details.set(root.current_lang.get("status_details_start_execution").get())
+        root.status_details.set(root.current_lang.get("status_details_calc_execution").get())
+        execution.run(policy, _gradient_tile, (buffer_in, buffer_mag, buffer_ori), tiles, ((kx, ky), taps, (sy, sx), (out_h, out_w), nms))
+        root.status_details.set(root.current_lang.get("status_details_tile_done").get())
+    except BaseException:
+        execution.discard(buffer_in)
+        execution.discard(buffer_mag)
+        execution.discard(buffer_ori)
+        raise
+    finally:
+        root.status_details.set(root.current_lang.get("status_details_unload_shared_memory").get())
+        execution.release(buffer_in)
+    if engine_stats is not None:
+        engine_stats["backend"] = "gradient"
+        engine_stats["nms"] = nms
+        engine_stats["actual_time"] = time.perf_counter() - start_time
+        engine_stats["tile_plan"] = plan
+        engine_stats["execution"] = policy
+
+    root.status_details.set(root.current_lang.get("status_details_done").get())
+    magnitude = execution.result(buffer_mag)
+    orientation = execution.result(buffer_ori) if buffer_ori is not None else None
+    return magnitude, orientation
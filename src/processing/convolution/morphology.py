@@ -0,0 +1,220 @@
+import time
+import numpy as np
+import numpy.typing as npt
+from typing import Any, Sequence, Tuple, List, Literal, Optional
+import src.gui.state.root as root
+import src.gui.utils.logger as log
+from src.gui.state.error import Error
+from pathlib import Path
+import src.processing.convolution.pool as pool
+import src.processing.convolution.border as border
+import src.processing.convolution.tiling as tiling
+import src.processing.convolution.execution as execution
+from src.processing.convolution.ranking import RankMode, Mask_Rect, VAN_HERK_COST, _cover_rectangles, _process_rank_output_tile
+
+
+Morph_Operation = Literal["opening", "closing", "top_hat", "morph_gradient"]
+Structuring_Element = Tuple[List[Tuple[int, int, float]], List[Mask_Rect] | None]
+
+MORPH_OPERATIONS: Tuple[str, ...] = ("opening", "closing", "top_hat", "morph_gradient")
+MORPH_STEPS: dict[str, Tuple[RankMode, RankMode]] = {
+    "opening": ("minimum", "maximum"),
+    "closing": ("maximum", "minimum"),
+    "top_hat": ("minimum", "maximum"),
+    "morph_gradient": ("maximum", "minimum")
+}
+SECOND_PASS_FILL: dict[str, float] = {"minimum": np.inf, "maximum": -np.inf}
+
+
+def _tile_view(out: np.ndarray, tile_coords_rc: Tuple[int, ...]) -> Tuple[slice, ...]:
+    r0, r1, c0, c1 = tile_coords_rc[:4]
+    if out.ndim == 2:
+        return slice(r0, r1), slice(c0, c1)
+    return slice(r0, r1), slice(c0, c1), slice(*tile_coords_rc[4:]) if len(tile_coords_rc) == 6 else slice(None)
+
+
+def _source_tile(src: np.ndarray, tile_coords_rc: Tuple[int, ...], stride_hw: Tuple[int, int], offset: Tuple[int, int], num_channels: int) -> np.ndarray:
+    r0, r1, c0, c1 = tile_coords_rc[:4]
+    sy, sx = stride_hw
+    rows = slice(offset[0] + r0 * sy, offset[0] + (r1 - 1) * sy + 1, sy)
+    cols = slice(offset[1] + c0 * sx, offset[1] + (c1 - 1) * sx + 1, sx)
+    if num_channels == 1:
+        return src[rows, cols]
+    chans = slice(*tile_coords_rc[4:]) if len(tile_coords_rc) == 6 else slice(None)
+    return np.moveaxis(src[chans, rows, cols], 0, 2)
+
+
+def _structuring_element(offsets: List[Tuple[int, int, float]], k_shape: Tuple[int, int]) -> Structuring_Element:
+    cover = _cover_rectangles(offsets, k_shape)
+    return offsets, cover if len(cover) * VAN_HERK_COST < len(offsets) else None
+
+
+def _process_morphology_tile(
+    src: np.ndarray,
+    mid: np.ndarray,
+    out: np.ndarray,
+    tile_coords_rc: Tuple[int, ...],
+    phase: int,
+    operation: Morph_Operation,
+    elements: Tuple[Structuring_Element, Structuring_Element],
+    stride_hw: Tuple[int, int],
+    num_channels: int,
+    mono_channels_equal: bool,
+    k_shape: Tuple[int, int],
+    pad_mode: str
+) -> None:
+    first, second = MORPH_STEPS[operation]
+    (offsets, rects), (reflected_offsets, reflected_rects) = elements
+    shared = (num_channels, mono_channels_equal, k_shape, pad_mode)
+    if operation == "morph_gradient":
+        _process_rank_output_tile(src, mid, tile_coords_rc, offsets, stride_hw, first, *shared, rects)
+        _process_rank_output_tile(src, out, tile_coords_rc, offsets, stride_hw, second, *shared, rects)
+        view = _tile_view(out, tile_coords_rc)
+        np.subtract(mid[view], out[view], out=out[view])
+        return
+    if phase == 0:
+        _process_rank_output_tile(src, mid, tile_coords_rc, offsets, (1, 1), first, *shared, rects)
+        return
+    mid_pad = "valid" if pad_mode == "valid" else "constant"
+    _process_rank_output_tile(mid if num_channels == 1 else np.moveaxis(mid, 2, 0), out, tile_coords_rc, reflected_offsets, stride_hw, second,
+                              num_channels, mono_channels_equal, k_shape, mid_pad, reflected_rects, fill=SECOND_PASS_FILL[second])
+    view = _tile_view(out, tile_coords_rc)
+    offset = (2 * (k_shape[0] // 2), 2 * (k_shape[1] // 2)) if pad_mode == "valid" else (0, 0)
+    source = _source_tile(src, tile_coords_rc, stride_hw, offset, num_channels)
+    np.copyto(out[view], source, where=~np.isfinite(out[view]))
+    if operation == "top_hat":
+        np.subtract(source, out[view], out=out[view])
+
+
+def morphology(
+    image: np.ndarray,
+    kernel: Sequence[Sequence[Optional[float]]],
+    *,
+    operation: Morph_Operation = "opening",
+    stride: Tuple[int, int] = (1, 1),
+    pad_mode: str = "reflect",
+    tile: int | None = None,
+    keep_free_cores: int | None = None,
+    max_workers: int | None = None,
+    engine_stats: dict[str, Any] | None = None,
+    cancel_token: int | None = None
+) -> npt.NDArray[np.float32]:
+    assert root.status_details is not None
+    root.status_details.set(root.current_lang.get("status_details_checking_sample_rate").get())
+    sy, sx = stride
+    if sy < 1 or sx < 1:
+        log.log.write(text=Error.CONVOLUTION_NEGATIVE_STRIDE.value, tag="CRITICAL ERROR", modulename=Path(__file__).stem)
+    if operation not in MORPH_OPERATIONS:
+        log.log.write(text=f"{Error.MORPHOLOGY_OPERATION.value} ({operation})", tag="CRITICAL ERROR", modulename=Path(__file__).stem)
+
+    root.status_details.set(root.current_lang.get("status_details_checking_kernal_dimensions").get())
+    k = np.asarray(kernel, dtype=object)
+    if k.ndim != 2:
+        log.log.write(text=Error.CONVOLUTION_KERNAL_DIMENSION.value, tag="CRITICAL ERROR", modulename=Path(__file__).stem)
+    kH, kW = k.shape
+    if kH % 2 == 0 or kW % 2 == 0:
+        log.log.write(text=Error.CONVOLUTION_KERNAL_DIMENSION_EVEN.value, tag="CRITICAL ERROR", modulename=Path(__file__).stem)
+    border.check(pad_mode)
+
+    root.status_details.set(root.current_lang.get("status_details_checking_kernal_values").get())
+    valid_offsets: List[Tuple[int, int, float]] = [(dy, dx, 1.0) for dy in range(kH) for dx in range(kW) if k[dy, dx] is not None]
+    n_valid = len(valid_offsets)
+    mid_h, mid_w = border.output_shape(image.shape[:2], (kH, kW), (1, 1), pad_mode)
+    if operation == "morph_gradient":
+        out_h, out_w = border.output_shape(image.shape[:2], (kH, kW), (sy, sx), pad_mode)
+        mid_h, mid_w = out_h, out_w
+    else:
+        out_h, out_w = border.output_shape((mid_h, mid_w), (kH, kW), (sy, sx), pad_mode)
+    if n_valid == 0:
+        root.status_details.set(root.current_lang.get("status_details_ranking_no_selection").get())
+        return np.zeros((out_h, out_w) if image.ndim == 2 else (out_h, out_w, image.shape[2]), dtype=np.float32)
+
+    root.status_details.set(root.current_lang.get("status_details_checking_image_datatype").get())
+    if np.issubdtype(image.dtype, np.integer):
+        img_in = image.astype(np.uint8, copy=False)
+    elif np.issubdtype(image.dtype, np.floating):
+        img_in = image.astype(np.float32, copy=False)
+    else:
+        log.log.write(text=Error.CONVOLUTION_IMAGE_DATA_TYPE.value, tag="CRITICAL ERROR", modulename=Path(__file__).stem)
+
+    root.status_details.set(root.current_lang.get("status_details_checking_gray_monochrom").get())
+    mono_channels_equal = False
+    if img_in.ndim == 3 and img_in.shape[2] >= 3:
+        ch0, ch1, ch2 = img_in[..., 0], img_in[..., 1], img_in[..., 2]
+        if np.issubdtype(img_in.dtype, np.integer):
+            mono_channels_equal = np.array_equal(ch0, ch1) and np.array_equal(ch1, ch2)
+        else:
+            mono_channels_equal = np.allclose(ch0, ch1, atol=1e-6) and np.allclose(ch1, ch2, atol=1e-6)
+
+    if img_in.ndim == 2:
+        num_channels = 1
+        mid_shape, out_shape, src = (mid_h, mid_w), (out_h, out_w), img_in
+    elif img_in.ndim == 3:
+        num_channels = img_in.shape[2]
+        mid_shape, out_shape, src = (mid_h, mid_w, num_channels), (out_h, out_w, num_channels), np.moveaxis(img_in, 2, 0)
+    else:
+        log.log.write(text=Error.RESIZE_IMAGE_NDIM.value, tag="CRITICAL ERROR", modulename=Path(__file__).stem)
+
+    root.status_details.set(root.current_lang.get("status_details_checking_number_worker").get())
+    if max_workers is None:
+        max_workers = pool.worker_count(keep_free_cores)
+
+    reflected_offsets: List[Tuple[int, int, float]] = sorted((kH - 1 - dy, kW - 1 - dx, w) for dy, dx, w in valid_offsets)
+    elements = (_structuring_element(valid_offsets, (kH, kW)), _structuring_element(reflected_offsets, (kH, kW)))
+    rects = elements[0][1]
+
+    root.status_details.set(root.current_lang.get("status_details_set_tile_splitting").get())
+    phases: List[Tuple[Tuple[int, int], Tuple[int, int]]] = [((out_h, out_w), (sy, sx))]
+    if operation != "morph_gradient":
+        phases.insert(0, ((mid_h, mid_w), (1, 1)))
+    plans: List[tiling.Tile_Plan] = []
+    phase_tiles: List[list[Tuple[int, ...]]] = []
+    for hw, phase_stride in phases:
+        if tile is not None:
+            plan = tiling.fixed_plan("morphology", hw, tile, max_workers)
+        else:
+            plan = tiling.plan_tiles("morphology", hw, phase_stride, (kH, kW), max_workers, in_bytes=4, work_bytes=12)
+        tiling.plan_channels(plan, 1 if mono_channels_equal else num_channels)
+        tiling.report(plan)
+        plans.append(plan)
+        phase_tiles.append(tiling.split(hw, plan, num_channels))
+    work = float(sum(h * w for (h, w), _ in phases) * num_channels * (len(rects) * VAN_HERK_COST if rects is not None else n_valid))
+    policy = execution.choose(work * (2 if operation == "morph_gradient" else 1), sum(len(t) for t in phase_tiles), max_workers)
+
+    root.status_details.set(root.current_lang.get("status_details_set_shared_memory").get())
+    buffer_in = execution.share(policy, src)
+    buffer_mid = execution.allocate(policy, mid_shape, np.float32)
+    buffer_out = execution.allocate(policy, out_shape, np.float32)
+
+    root.status_details.set(root.current_lang.get("status_details_start_execution").get())
+    start_time = time.perf_counter()
+    outer = execution.get_progress()
+    total = sum(len(t) for t in phase_tiles)
+    try:
+        root.status_details.set(root.current_lang.get("status_details_calc_execution").get())
+        done = 0
+        for phase, tiles in enumerate(phase_tiles):
+            if outer is not None:
+                execution.set_progress(lambda d, _t, base=done: outer(base + d, total))
+            execution.run(policy, _process_morphology_tile, (buffer_in, buffer_mid, buffer_out), tiles, (phase, operation, elements, (sy, sx), num_channels, mono_channels_equal, (kH, kW), pad_mode), cancel_token)
+            done += len(tiles)
+        root.status_details.set(root.current_lang.get("status_details_tile_done").get())
+    except BaseException:
+        execution.discard(buffer_in)
+        execution.discard(buffer_mid)
+        execution.discard(buffer_out)
+        raise
+    finally:
+        execution.set_progress(outer)
+        root.status_details.set(root.current_lang.get("status_details_unload_shared_memory").get())
+        execution.release(buffer_in)
+    execution.release(buffer_mid)
+    if engine_stats is not None:
+        engine_stats["backend"] = "morphology" if rects is None else "morphology/van_herk"
+        engine_stats["actual_time"] = time.perf_counter() - start_time
+        engine_stats["tile_plan"] = plans[-1]
+        engine_stats["execution"] = policy
+        engine_stats["phases"] = len(phases)
+
+    root.status_details.set(root.current_lang.get("status_details_done").get())
+    return execution.result(buffer_out)
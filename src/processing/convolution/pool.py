@@ -0,0 +1,139 @@
+import os
+import atexit
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import resource_tracker, sharedctypes
+import multiprocessing
+from pathlib import Path
+import src.gui.utils.logger as log
+from src.gui.state.error import Info
+
+
+KEEP_FREE_CORES: int = 1
+
+_executor: ProcessPoolExecutor | None = None
+_executor_workers: int = 0
+_thread_executor: ThreadPoolExecutor | None = None
+_thread_workers: int = 0
+_lock = threading.Lock()
+_generation: sharedctypes.Synchronized = multiprocessing.Value("q", 0)  # type: ignore
+
+
+def _warm_up(generation: sharedctypes.Synchronized | None = None) -> None:
+    global _generation
+    if generation is not None:
+        _generation = generation
+    import numpy  # noqa: F401
+    import cv2  # noqa: F401
+    import src.processing.convolution.default  # noqa: F401
+    import src.processing.convolution.ranking  # noqa: F401
+    import src.processing.convolution.morphology  # noqa: F401
+    import src.processing.convolution.gaussian  # noqa: F401
+    import src.processing.convolution.gradient  # noqa: F401
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+def generation() -> int:
+    return _generation.value
+
+
+def cancel() -> None:
+    with _generation.get_lock():
+        _generation.value += 1
+
+
+def worker_count(keep_free_cores: int | None = None) -> int:
+    if keep_free_cores is None:
+        keep_free_cores = KEEP_FREE_CORES
+    cpu = os.cpu_count() or 2
+    return max(1, cpu - max(1, keep_free_cores))
+
+
+def _spawn(workers: int) -> ProcessPoolExecutor:
+    if os.name == "posix":
+        resource_tracker.ensure_running()
+    ex = ProcessPoolExecutor(max_workers=workers, initializer=_warm_up, initargs=(_generation,))
+    for _ in range(workers):
+        ex.submit(_ping)
+    log.log.write(text=f"{Info.WORKER_POOL_STARTED.value} (workers={workers})", tag="INFO", modulename=Path(__file__).stem)
+    return ex
+
+
+def start(keep_free_cores: int | None = None) -> None:
+    global KEEP_FREE_CORES
+    if keep_free_cores is not None:
+        KEEP_FREE_CORES = keep_free_cores
+    get_executor()
+
+
+def get_executor() -> ProcessPoolExecutor:
+    global _executor, _executor_workers
+    max_workers = worker_count()
+    with _lock:
+        if _executor is not None and _executor._broken:  # type: ignore
+            _executor = None
+        if _executor is not None and _executor_workers != max_workers:
+            _executor.shutdown(wait=True, cancel_futures=True)
+            _executor = None
+        if _executor is None:
+            _executor = _spawn(max_workers)
+            _executor_workers = max_workers
+        return _executor
+
+
+def get_thread_executor() -> ThreadPoolExecutor:
+    global _thread_executor, _thread_workers
+    max_workers = worker_count()
+    with _lock:
+        if _thread_executor is not None and _thread_workers != max_workers:
+            _thread_executor.shutdown(wait=True, cancel_futures=True)
+            _thread_executor = None
+        if _thread_executor is None:
+            _thread_executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tile")
+            _thread_workers = max_workers
+        return _thread_executor
+
+
+def size(threads: bool = False) -> int:
+    return _thread_workers if threads else _executor_workers
+
+
+def resize(keep_free_cores: int) -> None:
+    global KEEP_FREE_CORES
+    KEEP_FREE_CORES = keep_free_cores
+    with _lock:
+        running = _executor is not None
+    if running:
+        start()
+
+
+def shutdown() -> None:
+    global _executor, _executor_workers, _thread_executor, _thread_workers
+    with _lock:
+        if _thread_executor is not None:
+            _thread_executor.shutdown(wait=True, cancel_futures=True)
+            _thread_executor = None
+            _thread_workers = 0
+        if _executor is None:
+            return
+        _executor.shutdown(wait=True, cancel_futures=True)
+        _executor = None
+        _executor_workers = 0
+    log.log.write(text=Info.WORKER_POOL_STOPPED.value, tag="INFO", modulename=Path(__file__).stem)
+
+
+@contextmanager
+def session(keep_free_cores: int | None = None) -> Iterator[ProcessPoolExecutor]:
+    start(keep_free_cores)
+    try:
+        yield get_executor()
+    finally:
+        shutdown()
+
+
+atexit.register(shutdown)
@@ -1,67 +1,232 @@
-import os
+import time
 import numpy as np
+import cv2
 import numpy.typing as npt
-from typing import Sequence, Tuple, List, Literal, Optional
-from concurrent.futures import ProcessPoolExecutor, as_completed
-from multiprocessing import shared_memory
+from typing import Any, Sequence, Tuple, List, Literal, Optional
 import src.gui.state.root as root
 import src.gui.utils.logger as log
 from src.gui.state.error import Error
 from pathlib import Path
+import src.processing.convolution.pool as pool
+import src.processing.convolution.border as border
+import src.processing.convolution.tiling as tiling
+import src.processing.convolution.execution as execution
+import src.processing.convolution.sorting_network as sorting_network
 
 
 RankMode = Literal["median", "minimum", "maximum", "25%_quantile", "75%_quantile"]
+Mask_Rect = Tuple[int, int, int, int]
+
+HISTOGRAM_MIN_TAPS: int = 49
+HISTOGRAM_COARSE_BITS: int = 4
+VAN_HERK_COST: int = 8
+RANK_MEMORY_BUDGET: int = 256 << 20
+SORTING_NETWORK_SHAPES: Tuple[Tuple[int, int], ...] = ((3, 3), (5, 5))
+
+
+def _kernel_mask(valid_kernel_offsets: List[Tuple[int, int, float]], k_shape: Tuple[int, int]) -> np.ndarray:
+    mask = np.zeros((k_shape[0] + 1, k_shape[1] + 1), dtype=bool)
+    for dy, dx, _w in valid_kernel_offsets:
+        mask[dy, dx] = True
+    return mask
+
+
+def _row_runs(row: np.ndarray) -> List[Tuple[int, int]]:
+    edges = np.flatnonzero(np.diff(np.concatenate(([False], row))))
+    return list(zip(edges[::2].tolist(), edges[1::2].tolist()))
+
+
+def _mask_rectangles(valid_kernel_offsets: List[Tuple[int, int, float]], k_shape: Tuple[int, int]) -> List[Mask_Rect]:
+    mask = _kernel_mask(valid_kernel_offsets, k_shape)
+    rects: List[Mask_Rect] = []
+    opened: dict[Tuple[int, int], int] = {}
+    for y in range(k_shape[0] + 1):
+        runs = set(_row_runs(mask[y]))
+        for run in [r for r in opened if r not in runs]:
+            rects.append((opened.pop(run), y) + run)
+        for run in runs:
+            opened.setdefault(run, y)
+    return rects
+
+
+def _cover_rectangles(valid_kernel_offsets: List[Tuple[int, int, float]], k_shape: Tuple[int, int]) -> List[Mask_Rect]:
+    kH = k_shape[0]
+    mask = _kernel_mask(valid_kernel_offsets, k_shape)
+    cover: set[Mask_Rect] = set()
+    for y in range(kH):
+        for x0, x1 in _row_runs(mask[y]):
+            full = mask[:kH, x0:x1].all(axis=1)
+            y0, y1 = y, y + 1
+            while y0 > 0 and full[y0 - 1]:
+                y0 -= 1
+            while y1 < kH and full[y1]:
+                y1 += 1
+            cover.add((y0, y1, x0, x1))
+    return sorted(r for r in cover if not any(o != r and o[0] <= r[0] and r[1] <= o[1] and o[2] <= r[2] and r[3] <= o[3] for o in cover))
+
+
+def _van_herk(a: np.ndarray, w: int, reducer: np.ufunc, axis: int) -> np.ndarray:
+    if w == 1:
+        return a
+
+    def along(part: slice) -> Tuple[slice, ...]:
+        return (slice(None),) * axis + (part,)
+
+    n = a.shape[axis]
+    prefix, suffix = a.copy(), a.copy()
+    for k in range(1, w):
+        dst = prefix[along(slice(k, None, w))]
+        reducer(dst, prefix[along(slice(k - 1, None, w))][along(slice(0, dst.shape[axis]))], out=dst)
+    for k in range(w - 2, -1, -1):
+        src = suffix[along(slice(k + 1, None, w))]
+        dst = suffix[along(slice(k, None, w))][along(slice(0, src.shape[axis]))]
+        reducer(dst, src, out=dst)
+    return reducer(suffix[along(slice(0, n - w + 1))], prefix[along(slice(w - 1, n))])
+
+
+def _rank_tile_van_herk(
+    slab: np.ndarray,
+    sy: int, sx: int,
+    rects: List[Mask_Rect],
+    reducer: np.ufunc,
+    th: int, tw: int
+) -> np.ndarray:
+    result: np.ndarray | None = None
+    for y0, y1, x0, x1 in rects:
+        h, w = y1 - y0, x1 - x0
+        rows = slab[y0:y0 + (th - 1) * sy + h, x0:x0 + (tw - 1) * sx + w]
+        line = _van_herk(rows, w, reducer, 1)[:, ::sx]
+        block = _van_herk(line, h, reducer, 0)[::sy]
+        result = block if result is None else reducer(result, block)
+    assert result is not None
+    return result
+
+
+def _rank_positions(n_valid: int, mode: RankMode) -> List[int]:
+    if mode == "median":
+        return [n_valid // 2] if n_valid % 2 else [n_valid // 2 - 1, n_valid // 2]
+    q = 0.25 if mode == "25%_quantile" else 0.75
+    return [int(np.floor(q * (n_valid - 1)))]
+
+
+def _stack_dtype(dtype: np.dtype, valid_kernel_offsets: List[Tuple[int, int, float]]) -> np.dtype:
+    if dtype == np.uint8 and all(w == 1.0 for _, _, w in valid_kernel_offsets):
+        return np.dtype(np.uint8)
+    return np.dtype(np.float32)
+
+
+def _window_counts(
+    slab: np.ndarray,
+    threshold: int,
+    sy: int, sx: int,
+    rects: List[Mask_Rect],
+    th: int, tw: int,
+    counts: np.ndarray
+) -> np.ndarray:
+    integral = cv2.integral(np.less_equal(slab, threshold).view(np.uint8))
+    counts[...] = 0
+    for y0, y1, x0, x1 in rects:
+        counts += integral[y1:y1 + th * sy:sy, x1:x1 + tw * sx:sx]
+        counts -= integral[y0:y0 + th * sy:sy, x1:x1 + tw * sx:sx]
+        counts -= integral[y1:y1 + th * sy:sy, x0:x0 + tw * sx:sx]
+        counts += integral[y0:y0 + th * sy:sy, x0:x0 + tw * sx:sx]
+    return counts
+
+
+def _rank_tile_histogram(
+    slab: np.ndarray,
+    sy: int, sx: int,
+    rects: List[Mask_Rect],
+    ranks: List[int],
+    th: int, tw: int
+) -> np.ndarray:
+    kH = max(r[1] for r in rects)
+    kW = max(r[3] for r in rects)
+    slab = slab[:(th - 1) * sy + kH, :(tw - 1) * sx + kW]
+    shift = 8 - HISTOGRAM_COARSE_BITS
+    counts = np.empty((th, tw), dtype=np.int32)
+    coarse = [np.zeros((th, tw), dtype=np.int32) for _ in ranks]
+    for b in range(1 << HISTOGRAM_COARSE_BITS):
+        _window_counts(slab, ((b + 1) << shift) - 1, sy, sx, rects, th, tw, counts)
+        below = [counts <= r for r in ranks]
+        if not any(m.any() for m in below):
+            break
+        for acc, m in zip(coarse, below):
+            acc += m
+    low = min(int(acc.min()) for acc in coarse) << shift
+    high = (max(int(acc.max()) for acc in coarse) + 1) << shift
+    selected = [np.full((th, tw), low, dtype=np.int32) for _ in ranks]
+    for t in range(low, high - 1):
+        _window_counts(slab, t, sy, sx, rects, th, tw, counts)
+        for acc, r in zip(selected, ranks):
+            acc += counts <= r
+    if len(selected) == 1:
+        return selected[0].astype(np.float32)
+    return 0.5 * (selected[0].astype(np.float32) + selected[1])
 
 
 def _process_rank_output_tile(
-    shm_input_name: str,
-    padded_input_shape: Tuple[int, ...],
-    input_dtype_name: str,
-    shm_output_name: str,
-    output_shape: Tuple[int, ...],
-    tile_coords_rc: Tuple[int, int, int, int],
+    src: np.ndarray,
+    out: np.ndarray,
+    tile_coords_rc: Tuple[int, ...],
     valid_kernel_offsets: List[Tuple[int, int, float]],
     stride_hw: Tuple[int, int],
     mode: RankMode,
     num_channels: int,
-    mono_channels_equal: bool
+    mono_channels_equal: bool,
+    k_shape: Tuple[int, int],
+    pad_mode: str,
+    rects: List[Mask_Rect] | None,
+    network: bool = False,
+    fill: float = 0.0
 ) -> None:
 
     sy, sx = stride_hw
-    r0, r1, c0, c1 = tile_coords_rc
+    kH, kW = k_shape
+    oh, ow = border.origin(k_shape, pad_mode)
+    r0, r1, c0, c1 = tile_coords_rc[:4]
+    ch0, ch1 = tile_coords_rc[4:] if len(tile_coords_rc) == 6 else (0, num_channels)
     th, tw = r1 - r0, c1 - c0
+    y0, x0 = r0 * sy - oh, c0 * sx - ow
+    y1, x1 = (r1 - 1) * sy - oh + kH, (c1 - 1) * sx - ow + kW
 
-    dtype_map = {"uint8": np.uint8, "float32": np.float32}
-    in_dtype = dtype_map[input_dtype_name]
+    if num_channels == 1:
+        slab = border.window(src, y0, y1, x0, x1, pad_mode, fill=fill)
+        _rank_tile_grayscale(slab, out[r0:r1, c0:c1], 0, th, 0, tw, sy, sx, valid_kernel_offsets, mode, th, tw, rects, network)
 
-    shm_in = shared_memory.SharedMemory(name=shm_input_name)
-    shm_out = shared_memory.SharedMemory(name=shm_output_name)
-    try:
-        if num_channels == 1:
-            padded = np.ndarray(padded_input_shape, dtype=in_dtype, buffer=shm_in.buf)
-            out = np.ndarray(output_shape, dtype=np.float32, buffer=shm_out.buf)
-            _rank_tile_grayscale(padded, out, r0, r1, c0, c1, sy, sx, valid_kernel_offsets, mode, th, tw)
+    elif mono_channels_equal and num_channels >= 3:
+        slab = border.window(src[0], y0, y1, x0, x1, pad_mode, fill=fill)
+        _rank_tile_grayscale(slab, out[r0:r1, c0:c1, 0], 0, th, 0, tw, sy, sx, valid_kernel_offsets, mode, th, tw, rects, network)
 
-        else:
-            padded = np.ndarray(padded_input_shape, dtype=in_dtype, buffer=shm_in.buf)
-            out = np.ndarray(output_shape, dtype=np.float32, buffer=shm_out.buf)
+        up_to = min(3, num_channels)
+        out[r0:r1, c0:c1, 1:up_to] = out[r0:r1, c0:c1, [0]]
 
-            if mono_channels_equal and num_channels >= 3:
-                _rank_tile_grayscale(padded[..., 0], out[..., 0], r0, r1, c0, c1, sy, sx, valid_kernel_offsets, mode, th, tw)
+        for ch in range(up_to, num_channels):
+            slab = border.window(src[ch], y0, y1, x0, x1, pad_mode, fill=fill)
+            _rank_tile_grayscale(slab, out[r0:r1, c0:c1, ch], 0, th, 0, tw, sy, sx, valid_kernel_offsets, mode, th, tw, rects, network)
 
-                up_to = min(3, num_channels)
-                out[r0:r1, c0:c1, 1:up_to] = out[r0:r1, c0:c1, [0]]
+    else:
+        for ch in range(ch0, ch1):
+            slab = border.window(src[ch], y0, y1, x0, x1, pad_mode, fill=fill)
+            _rank_tile_grayscale(slab, out[r0:r1, c0:c1, ch], 0, th, 0, tw, sy, sx,
+                                 valid_kernel_offsets, mode, th, tw, rects, network)
 
-                for ch in range(up_to, num_channels):
-                    _rank_tile_grayscale(padded[..., ch], out[..., ch], r0, r1, c0, c1, sy, sx, valid_kernel_offsets, mode, th, tw)
 
-            else:
-                for ch in range(num_channels):
-                    _rank_tile_grayscale(padded[..., ch], out[..., ch], r0, r1, c0, c1, sy, sx,
-                                         valid_kernel_offsets, mode, th, tw)
-    finally:
-        shm_in.close()
-        shm_out.close()
+def _rank_tile_network(
+    padded_2d: np.ndarray,
+    r0: int, r1: int, c0: int, c1: int,
+    sy: int, sx: int,
+    valid_kernel_offsets: List[Tuple[int, int, float]],
+    rank: int
+) -> np.ndarray:
+    network, target = sorting_network.selection(len(valid_kernel_offsets), rank)
+    dtype = _stack_dtype(padded_2d.dtype, valid_kernel_offsets)
+    wires: List[np.ndarray] = []
+    for dy, dx, _w in valid_kernel_offsets:
+        rs = slice(dy + r0 * sy, dy + r1 * sy, sy)
+        cs = slice(dx + c0 * sx, dx + c1 * sx, sx)
+        wires.append(padded_2d[rs, cs].astype(dtype))
+    return sorting_network.select(wires, network, target)
 
 
 def _rank_tile_grayscale(
@@ -71,13 +236,26 @@ def _rank_tile_grayscale(
     sy: int, sx: int,
     valid_kernel_offsets: List[Tuple[int, int, float]],
     mode: RankMode,
-    th: int, tw: int
+    th: int, tw: int,
+    rects: List[Mask_Rect] | None = None,
+    network: bool = False
 ) -> None:
     n_valid = len(valid_kernel_offsets)
     if n_valid == 0:
         out_2d[r0:r1, c0:c1] = 0.0
         return
 
+    if network:
+        out_2d[r0:r1, c0:c1] = _rank_tile_network(padded_2d, r0, r1, c0, c1, sy, sx, valid_kernel_offsets, _rank_positions(n_valid, mode)[0])
+        return
+
+    if rects is not None and mode in {"minimum", "maximum"}:
+        out_2d[r0:r1, c0:c1] = _rank_tile_van_herk(padded_2d[r0 * sy:, c0 * sx:], sy, sx, rects, np.minimum if mode == "minimum" else np.maximum, th, tw)
+        return
+    if rects is not None:
+        out_2d[r0:r1, c0:c1] = _rank_tile_histogram(padded_2d[r0 * sy:, c0 * sx:], sy, sx, rects, _rank_positions(n_valid, mode), th, tw)
+        return
+
     if mode in {"minimum", "maximum"}:
         reducer = np.minimum if mode == "minimum" else np.maximum
         agg = np.full((th, tw), np.inf if mode == "minimum" else -np.inf, dtype=np.float32)
@@ -89,28 +267,21 @@ def _rank_tile_grayscale(
             reducer(agg, tmp, out=agg)
         out_2d[r0:r1, c0:c1] = agg
         return
-    stack = np.empty((n_valid, th, tw), dtype=np.float32)
+    stack = np.empty((n_valid, th, tw), dtype=_stack_dtype(padded_2d.dtype, valid_kernel_offsets))
     for i, (dy, dx, w) in enumerate(valid_kernel_offsets):
         rs = slice(dy + r0 * sy, dy + r1 * sy, sy)
         cs = slice(dx + c0 * sx, dx + c1 * sx, sx)
-        np.multiply(padded_2d[rs, cs], np.float32(w), out=stack[i])
-
-    if mode == "median":
-        if n_valid % 2:
-            k = n_valid // 2
-            part = np.partition(stack, k, axis=0)
-            sel = part[k]
+        if stack.dtype == np.uint8:
+            np.copyto(stack[i], padded_2d[rs, cs])
         else:
-            k1 = n_valid // 2 - 1
-            k2 = n_valid // 2
-            p1 = np.partition(stack, k1, axis=0)[k1]
-            p2 = np.partition(stack, k2, axis=0)[k2]
-            sel = 0.5 * (p1 + p2)
+            np.multiply(padded_2d[rs, cs], np.float32(w), out=stack[i])
+
+    ranks = _rank_positions(n_valid, mode)
+    stack.partition(ranks, axis=0)
+    if len(ranks) == 1:
+        sel = stack[ranks[0]]
     else:
-        q = 0.25 if mode == "25%_quantile" else 0.75
-        qidx = int(np.floor(q * (n_valid - 1)))
-        part = np.partition(stack, qidx, axis=0)
-        sel = part[qidx]
+        sel = 0.5 * (stack[ranks[0]].astype(np.float32) + stack[ranks[1]])
 
     out_2d[r0:r1, c0:c1] = sel
 
@@ -122,9 +293,11 @@ def ranking(
     mode: RankMode = "median",
     stride: Tuple[int, int] = (1, 1),
     pad_mode: str = "reflect",
-    tile: int = 64,
-    keep_free_cores: int = 1,
-    max_workers: int | None = None
+    tile: int | None = None,
+    keep_free_cores: int | None = None,
+    max_workers: int | None = None,
+    engine_stats: dict[str, Any] | None = None,
+    cancel_token: int | None = None
 ) -> npt.NDArray[np.float32]:
     assert root.status_details is not None
     root.status_details.set(root.current_lang.get("status_details_checking_sample_rate").get())
@@ -139,7 +312,7 @@ def ranking(
     kH, kW = k.shape
     if kH % 2 == 0 or kW % 2 == 0:
         log.log.write(text=Error.CONVOLUTION_KERNAL_DIMENSION_EVEN.value, tag="CRITICAL ERROR", modulename=Path(__file__).stem)
-    pad_h, pad_w = kH // 2, kW // 2
+    border.check(pad_mode)
 
     root.status_details.set(root.current_lang.get("status_details_checking_kernal_values").get())
     valid_offsets: List[Tuple[int, int, float]] = []
@@ -157,18 +330,14 @@ def ranking(
     n_valid = len(valid_offsets)
     if n_valid == 0:
         root.status_details.set(root.current_lang.get("status_details_ranking_no_selection").get())
-        H, W = image.shape[:2]
-        out_h = (H + sy - 1) // sy
-        out_w = (W + sx - 1) // sx
+        out_h, out_w = border.output_shape(image.shape[:2], (kH, kW), (sy, sx), pad_mode)
         return np.zeros((out_h, out_w) if image.ndim == 2 else (out_h, out_w, image.shape[2]), dtype=np.float32)
 
     root.status_details.set(root.current_lang.get("status_details_checking_image_datatype").get())
     if np.issubdtype(image.dtype, np.integer):
         img_in = image.astype(np.uint8, copy=False)
-        input_dtype_name = "uint8"
     elif np.issubdtype(image.dtype, np.floating):
         img_in = image.astype(np.float32, copy=False)
-        input_dtype_name = "float32"
     else:
         log.log.write(text=Error.CONVOLUTION_IMAGE_DATA_TYPE.value, tag="CRITICAL ERROR", modulename=Path(__file__).stem)
 
@@ -181,76 +350,74 @@ def ranking(
         else:
             mono_channels_equal = np.allclose(ch0, ch1, atol=1e-6) and np.allclose(ch1, ch2, atol=1e-6)
 
-    root.status_details.set(root.current_lang.get("status_details_set_padding").get())
     if img_in.ndim == 2:
-        padded = (np.pad(img_in, ((pad_h, pad_h), (pad_w, pad_w)), mode="constant", constant_values=0) if pad_mode == "constant" else np.pad(img_in, ((pad_h, pad_h), (pad_w, pad_w)), mode=pad_mode))  # type: ignore
         num_channels = 1
-        Hp, Wp = padded.shape
-        H, W = img_in.shape
-        out_h = (H + sy - 1) // sy
-        out_w = (W + sx - 1) // sx
-        out_shape, in_shape = (out_h, out_w), (Hp, Wp)
+        out_h, out_w = border.output_shape(img_in.shape, (kH, kW), (sy, sx), pad_mode)
+        out_shape, src = (out_h, out_w), img_in
 
     elif img_in.ndim == 3:
-        padded = (np.pad(img_in, ((pad_h, pad_h), (pad_w, pad_w), (0, 0)), mode="constant", constant_values=0) if pad_mode == "constant" else np.pad(img_in, ((pad_h, pad_h), (pad_w, pad_w), (0, 0)), mode=pad_mode))  # type: ignore
         num_channels = img_in.shape[2]
-        Hp, Wp, _ = padded.shape
-        H, W, _ = img_in.shape
-        out_h = (H + sy - 1) // sy
-        out_w = (W + sx - 1) // sx
-        out_shape, in_shape = (out_h, out_w, num_channels), (Hp, Wp, num_channels)
+        out_h, out_w = border.output_shape(img_in.shape[:2], (kH, kW), (sy, sx), pad_mode)
+        out_shape, src = (out_h, out_w, num_channels), np.moveaxis(img_in, 2, 0)
     else:
         log.log.write(text=Error.RESIZE_IMAGE_NDIM.value, tag="CRITICAL ERROR", modulename=Path(__file__).stem)
 
-    root.status_details.set(root.current_lang.get("status_details_set_shared_memory").get())
-    shm_in = shared_memory.SharedMemory(create=True, size=padded.nbytes)
-    buf_in = np.ndarray(in_shape, dtype=padded.dtype, buffer=shm_in.buf)
-
-    root.status_details.set(root.current_lang.get("status_details_load_image_shared_memory").get())
-    np.copyto(buf_in, padded, casting="no")
+    root.status_details.set(root.current_lang.get("status_details_checking_number_worker").get())
+    if max_workers is None:
+        max_workers = pool.worker_count(keep_free_cores)
 
-    root.status_details.set(root.current_lang.get("status_details_set_shared_memory").get())
-    out_nbytes = int(np.prod(out_shape, dtype=np.int64)) * np.dtype(np.float32).itemsize
-    shm_out = shared_memory.SharedMemory(create=True, size=out_nbytes)
-    buf_out = np.ndarray(out_shape, dtype=np.float32, buffer=shm_out.buf)
+    network = mode == "median" and (kH, kW) in SORTING_NETWORK_SHAPES and n_valid == kH * kW and all(w == 1.0 for _, _, w in valid_offsets)
+    rects: List[Mask_Rect] | None = None
+    if img_in.dtype == np.uint8 and mode not in ("minimum", "maximum") and n_valid >= HISTOGRAM_MIN_TAPS and all(w == 1.0 for _, _, w in valid_offsets):
+        rects = _mask_rectangles(valid_offsets, (kH, kW))
+    elif mode in ("minimum", "maximum"):
+        cover = _cover_rectangles(valid_offsets, (kH, kW))
+        if len(cover) * VAN_HERK_COST < n_valid:
+            rects = cover
 
     root.status_details.set(root.current_lang.get("status_details_set_tile_splitting").get())
-    tiles: List[Tuple[int, int, int, int]] = []
-    for r0 in range(0, out_h, tile):
-        r1 = min(r0 + tile, out_h)
-        for c0 in range(0, out_w, tile):
-            c1 = min(c0 + tile, out_w)
-            tiles.append((r0, r1, c0, c1))
+    if tile is not None:
+        plan = tiling.fixed_plan("ranking", (out_h, out_w), tile, max_workers)
+    elif rects is not None and mode in ("minimum", "maximum"):
+        plan = tiling.plan_tiles("ranking/van_herk", (out_h, out_w), (sy, sx), (kH, kW), max_workers, in_bytes=img_in.dtype.itemsize, work_bytes=4 * img_in.dtype.itemsize + 4)
+    elif rects is not None:
+        plan = tiling.plan_tiles("ranking/histogram", (out_h, out_w), (sy, sx), (kH, kW), max_workers, in_bytes=5, work_bytes=20)
+    else:
+        plan = tiling.plan_tiles("ranking", (out_h, out_w), (sy, sx), (kH, kW), max_workers, in_bytes=img_in.dtype.itemsize, work_bytes=4 + n_valid * _stack_dtype(img_in.dtype, valid_offsets).itemsize)
+    stack_bytes = 0
+    if rects is None and mode not in ("minimum", "maximum"):
+        stack_bytes = n_valid * _stack_dtype(img_in.dtype, valid_offsets).itemsize + 4
+        tiling.cap_tile(plan, (out_h, out_w), RANK_MEMORY_BUDGET // (max(1, max_workers) * stack_bytes))
+    tiling.plan_channels(plan, 1 if mono_channels_equal else num_channels)
+    tiling.report(plan)
+    tiles = tiling.split((out_h, out_w), plan, num_channels)
+    policy = execution.choose(float(out_h * out_w * num_channels * n_valid * max(1, int(np.log2(n_valid)))), len(tiles), max_workers)
 
-    root.status_details.set(root.current_lang.get("status_details_checking_number_worker").get())
-    if max_workers is None:
-        cpu = os.cpu_count() or 2
-        max_workers = max(1, cpu - max(0, keep_free_cores))
+    root.status_details.set(root.current_lang.get("status_details_set_shared_memory").get())
+    buffer_in = execution.share(policy, src)
+
+    root.status_details.set(root.current_lang.get("status_details_set_shared_memory").get())
+    buffer_out = execution.allocate(policy, out_shape, np.float32)
 
     root.status_details.set(root.current_lang.get("status_details_start_execution").get())
+    start_time = time.perf_counter()
     try:
-        with ProcessPoolExecutor(max_workers=max_workers) as ex:
-            futures = [
-                ex.submit(
-                    _process_rank_output_tile,
-                    shm_in.name, in_shape, input_dtype_name,
-                    shm_out.name, out_shape,
-                    tile_ij, valid_offsets, (sy, sx), mode, num_channels,
-                    mono_channels_equal
-                )
-                for tile_ij in tiles
-            ]
-            root.status_details.set(root.current_lang.get("status_details_calc_execution").get())
-            for f in as_completed(futures):
-                f.result()
-            root.status_details.set(root.current_lang.get("status_details_tile_done").get())
-        result = buf_out.copy()
+        root.status_details.set(root.current_lang.get("status_details_calc_execution").get())
+        execution.run(policy, _process_rank_output_tile, (buffer_in, buffer_out), tiles, (valid_offsets, (sy, sx), mode, num_channels, mono_channels_equal, (kH, kW), pad_mode, rects, network), cancel_token)
+        root.status_details.set(root.current_lang.get("status_details_tile_done").get())
+    except BaseException:
+        execution.discard(buffer_in)
+        execution.discard(buffer_out)
+        raise
     finally:
         root.status_details.set(root.current_lang.get("status_details_unload_shared_memory").get())
-        shm_in.close()
-        shm_in.unlink()
-        shm_out.close()
-        shm_out.unlink()
+        execution.release(buffer_in)
+    if engine_stats is not None:
+        engine_stats["backend"] = "ranking/network" if network else "ranking" if rects is None else "ranking/van_herk" if mode in ("minimum", "maximum") else "ranking/histogram"
+        engine_stats["actual_time"] = time.perf_counter() - start_time
+        engine_stats["tile_plan"] = plan
+        engine_stats["execution"] = policy
+        engine_stats["peak_stack_bytes"] = stack_bytes * plan["tile_h"] * plan["tile_w"] * min(max_workers, plan["n_tiles"])
 
     root.status_details.set(root.current_lang.get("status_details_done").get())
-    return result
+    return execution.result(buffer_out)
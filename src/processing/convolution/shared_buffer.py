@@ -0,0 +1,47 @@
+import numpy as np
+from typing import Tuple
+from multiprocessing import shared_memory
+import src.processing.convolution.arena as arena
+
+
+def create(shape: Tuple[int, ...], dtype: np.dtype | type) -> Tuple[shared_memory.SharedMemory, np.ndarray]:
+    nbytes = max(1, int(np.prod(shape, dtype=np.int64)) * np.dtype(dtype).itemsize)
+    shm = arena.acquire(nbytes)
+    return shm, np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+
+def release(shm: shared_memory.SharedMemory) -> None:
+    arena.recycle(shm)
+
+
+def discard(shm: shared_memory.SharedMemory) -> None:
+    arena.discard(shm)
+
+
+def detach(shm: shared_memory.SharedMemory, shape: Tuple[int, ...], dtype: np.dtype | type) -> np.ndarray:
+    return arena.adopt(shm, shape, dtype)
+
+
+def pad_into(
+    dst: np.ndarray,
+    src: np.ndarray,
+    pad_h: int,
+    pad_w: int,
+    mode: str = "constant"
+) -> None:
+    H, W = src.shape[:2]
+    np.copyto(dst[pad_h:pad_h + H, pad_w:pad_w + W], src, casting="unsafe")
+    if mode == "constant":
+        dst[:pad_h] = 0
+        dst[pad_h + H:] = 0
+        dst[pad_h:pad_h + H, :pad_w] = 0
+        dst[pad_h:pad_h + H, pad_w + W:] = 0
+        return
+    rows = np.pad(np.arange(H), (pad_h, pad_h), mode=mode)  # type: ignore
+    cols = np.pad(np.arange(W), (pad_w, pad_w), mode=mode)  # type: ignore
+    if pad_h > 0:
+        dst[:pad_h, pad_w:pad_w + W] = dst[rows[:pad_h] + pad_h, pad_w:pad_w + W]
+        dst[pad_h + H:, pad_w:pad_w + W] = dst[rows[pad_h + H:] + pad_h, pad_w:pad_w + W]
+    if pad_w > 0:
+        dst[:, :pad_w] = dst[:, cols[:pad_w] + pad_w]
+        dst[:, pad_w + W:] = dst[:, cols[pad_w + W:] + pad_w]
@@ -0,0 +1,71 @@
+from functools import lru_cache
+from typing import List, Tuple
+import numpy as np
+
+
+Exchange = Tuple[int, int, bool, bool]
+
+MEDIAN_9: List[Tuple[int, int]] = [
+    (1, 2), (4, 5), (7, 8), (0, 1), (3, 4), (6, 7), (1, 2), (4, 5), (7, 8), (0, 3),
+    (5, 8), (4, 7), (3, 6), (1, 4), (2, 5), (4, 7), (4, 2), (6, 4), (4, 2)
+]
+
+
+def _batcher(n: int) -> List[Tuple[int, int]]:
+    pairs: List[Tuple[int, int]] = []
+    p = 1
+    while p < n:
+        k = p
+        while k >= 1:
+            for j in range(k % p, n - k, 2 * k):
+                for i in range(min(k, n - j - k)):
+                    if (i + j) // (2 * p) == (i + j + k) // (2 * p):
+                        pairs.append((i + j, i + j + k))
+            k //= 2
+        p *= 2
+    return pairs
+
+
+def _prune(pairs: List[Tuple[int, int]], target: int) -> List[Exchange]:
+    needed = {target}
+    network: List[Exchange] = []
+    for lo, hi in reversed(pairs):
+        if lo in needed or hi in needed:
+            network.append((lo, hi, lo in needed, hi in needed))
+            needed |= {lo, hi}
+    network.reverse()
+    return network
+
+
+@lru_cache(maxsize=None)
+def selection(n: int, rank: int) -> Tuple[List[Exchange], int]:
+    if n == 9 and rank == 4:
+        return _prune(MEDIAN_9, 4), 4
+    size = 1 << max(0, (n - 1).bit_length())
+    slot = list(range(size))
+    inf = set(range(n, size))
+    pairs: List[Tuple[int, int]] = []
+    for a, b in _batcher(size):
+        if b in inf:
+            continue
+        if a in inf:
+            slot[a], slot[b] = slot[b], slot[a]
+            inf.discard(a)
+            inf.add(b)
+            continue
+        pairs.append((slot[a], slot[b]))
+    return _prune(pairs, slot[rank]), slot[rank]
+
+
+def select(wires: List[np.ndarray], network: List[Exchange], target: int) -> np.ndarray:
+    spare = np.empty_like(wires[0])
+    for lo, hi, keep_min, keep_max in network:
+        if keep_min and keep_max:
+            np.minimum(wires[lo], wires[hi], out=spare)
+            np.maximum(wires[lo], wires[hi], out=wires[hi])
+            wires[lo], spare = spare, wires[lo]
+        elif keep_min:
+            np.minimum(wires[lo], wires[hi], out=wires[lo])
+        else:
+            np.maximum(wires[lo], wires[hi], out=wires[hi])
+    return wires[target]
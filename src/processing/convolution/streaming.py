@@ -0,0 +1,221 @@
+import os
+import tempfile
+import weakref
+from pathlib import Path
+from typing import Any, Callable, Sequence, Tuple, Optional
+import numpy as np
+import numpy.typing as npt
+import cv2
+from src.gui.state import root
+import src.gui.utils.logger as log
+from src.gui.state.error import Error, Info
+import src.processing.convolution.default as engine
+import src.processing.convolution.execution as execution
+from src.processing.convolution.ranking import ranking, RankMode
+from src.processing.convolution.morphology import morphology, Morph_Operation
+
+
+STREAM_MIN_BYTES: int = 1 << 30
+BAND_BYTES: int = 64 << 20
+BAND_COPIES: int = 4
+STREAM_DIR: str | None = None
+STREAM_PREFIX: str = "cvstudio_"
+
+_swept: bool = False
+
+
+def should_stream(image: np.ndarray) -> bool:
+    return isinstance(image, np.memmap) or image.nbytes >= STREAM_MIN_BYTES
+
+
+def load_image(path: str) -> np.ndarray | None:
+    if path.lower().endswith(".npy"):
+        return np.load(path, mmap_mode="r")
+    return cv2.imread(path)
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        log.log.write(text=f"{Error.STREAM_TEMP_REMOVE.value} ({path}: {e})", tag="WARNING", modulename=Path(__file__).stem)
+
+
+def _sweep() -> None:
+    global _swept
+    _swept = True
+    for path in Path(STREAM_DIR or tempfile.gettempdir()).glob(f"{STREAM_PREFIX}*.dat"):
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+
+def create_output(shape: Tuple[int, ...], dtype: np.dtype | type) -> np.memmap:
+    if not _swept:
+        _sweep()
+    fd, path = tempfile.mkstemp(prefix=STREAM_PREFIX, suffix=".dat", dir=STREAM_DIR)
+    os.close(fd)
+    out = np.memmap(path, dtype=dtype, mode="w+", shape=shape)
+    weakref.finalize(out._mmap, _remove, path)  # type: ignore
+    return out
+
+
+def _band_rows(width: int, channels: int, sy: int) -> int:
+    return max(1, BAND_BYTES // max(1, width * channels * 4 * BAND_COPIES * sy))
+
+
+def _is_multichannel_gray(image: np.ndarray, rows: int) -> bool:
+    if image.ndim != 3 or image.shape[2] < 2:
+        return False
+    n, total, total_sq = 0, 0.0, 0.0
+    for r0 in range(0, image.shape[0], rows):
+        diff = np.asarray(image[r0:r0 + rows, :, 0], dtype=np.float64) - image[r0:r0 + rows, :, 1]
+        n += diff.size
+        total += float(diff.sum())
+        total_sq += float(np.square(diff).sum())
+    mean = total / max(1, n)
+    return total_sq / max(1, n) - mean * mean < 1e-8
+
+
+def _run_bands(
+    image: np.ndarray,
+    out: np.ndarray,
+    halo: int,
+    sy: int,
+    rows: int,
+    process: Callable[[np.ndarray], np.ndarray],
+    cancel_token: int | None = None
+) -> int:
+    H = image.shape[0]
+    out_h = out.shape[0]
+    halo_out = -(-halo // sy)
+    total_bands = -(-out_h // rows)
+    outer = execution.get_progress()
+    n_bands = 0
+    try:
+        for o0 in range(0, out_h, rows):
+            execution.check(cancel_token)
+            if outer is not None:
+                execution.set_progress(lambda done, total, band=n_bands: outer(band * total + done, total_bands * total))
+            o1 = min(o0 + rows, out_h)
+            b0 = max(0, (o0 - halo_out) * sy)
+            b1 = min(H, (o1 - 1) * sy + halo + 1)
+            skip = o0 - b0 // sy
+            result = process(np.ascontiguousarray(image[b0:b1]))
+            out[o0:o1] = result[skip:skip + o1 - o0]
+            n_bands += 1
+            if root.status_details is not None:
+                root.status_details.set(f"{root.current_lang.get('status_details_calc_execution').get()} ({n_bands}/{total_bands})")
+    finally:
+        execution.set_progress(outer)
+    return n_bands
+
+
+def stream_default(
+    image: npt.NDArray,
+    kernel: list[list[float]],
+    stride: Tuple[int, int] = (1, 1),
+    edge_filter: bool = False,
+    use_conv_scale: bool = True,
+    engine_stats: dict[str, Any] | None = None,
+    cancel_token: int | None = None
+) -> np.memmap:
+    k = np.asarray(kernel, dtype=np.float32)
+    kH, kW = k.shape
+    sy, sx = stride
+    H, W = image.shape[:2]
+    out_h, out_w = (H + sy - 1) // sy, (W + sx - 1) // sx
+    in_channels = image.shape[2] if image.ndim == 3 else 1
+    rows = _band_rows(W, in_channels, sy)
+
+    gray = edge_filter or image.ndim == 2 or image.shape[2] in (1, 2) or _is_multichannel_gray(image, rows * sy)
+    channels = 1 if gray else 3
+    out = create_output((out_h, out_w) if gray else (out_h, out_w, 3), np.uint8 if gray and use_conv_scale else np.float32)
+
+    band_stats: dict[str, Any] = {}
+
+    def process(band: np.ndarray) -> np.ndarray:
+        return engine.default(
+            band, kernel, stride, edge_filter, use_conv_scale,
+            engine_stats=band_stats, force_channels=channels,
+            force_backend=band_stats.get("backend"), suppress_border=False,
+            cancel_token=cancel_token
+        )
+
+    n_bands = _run_bands(image, out, kH // 2, sy, rows, process, cancel_token)
+    if engine.SUPPRESS_PADDING_BORDER:
+        engine._suppress_border(out, kH // 2, kW // 2)
+    out.flush()
+    log.log.write(text=f"{Info.STREAMED_CONVOLUTION.value} (bands={n_bands}, rows={rows}, file={out.filename})", tag="INFO", modulename=Path(__file__).stem)
+    if engine_stats is not None:
+        engine_stats.update(band_stats)
+        engine_stats["streamed"] = {"bands": n_bands, "band_rows": rows, "band_bytes": BAND_BYTES}
+    return out
+
+
+def stream_ranking(
+    image: np.ndarray,
+    kernel: Sequence[Sequence[Optional[float]]],
+    *,
+    mode: RankMode = "median",
+    stride: Tuple[int, int] = (1, 1),
+    pad_mode: str = "reflect",
+    engine_stats: dict[str, Any] | None = None,
+    cancel_token: int | None = None
+) -> np.memmap:
+    kH = len(kernel)
+    sy, sx = stride
+    H, W = image.shape[:2]
+    out_h, out_w = (H + sy - 1) // sy, (W + sx - 1) // sx
+    in_channels = image.shape[2] if image.ndim == 3 else 1
+    rows = _band_rows(W, in_channels, sy)
+    out = create_output((out_h, out_w) if image.ndim == 2 else (out_h, out_w, in_channels), np.float32)
+
+    band_stats: dict[str, Any] = {}
+
+    def process(band: np.ndarray) -> np.ndarray:
+        return ranking(band, kernel, mode=mode, stride=stride, pad_mode=pad_mode, engine_stats=band_stats, cancel_token=cancel_token)
+
+    n_bands = _run_bands(image, out, kH // 2, sy, rows, process, cancel_token)
+    out.flush()
+    log.log.write(text=f"{Info.STREAMED_CONVOLUTION.value} (bands={n_bands}, rows={rows}, file={out.filename})", tag="INFO", modulename=Path(__file__).stem)
+    if engine_stats is not None:
+        engine_stats.update(band_stats)
+        engine_stats["streamed"] = {"bands": n_bands, "band_rows": rows, "band_bytes": BAND_BYTES}
+    return out
+
+
+def stream_morphology(
+    image: np.ndarray,
+    kernel: Sequence[Sequence[Optional[float]]],
+    *,
+    operation: Morph_Operation = "opening",
+    stride: Tuple[int, int] = (1, 1),
+    pad_mode: str = "reflect",
+    engine_stats: dict[str, Any] | None = None,
+    cancel_token: int | None = None
+) -> np.memmap:
+    kH = len(kernel)
+    sy, sx = stride
+    H, W = image.shape[:2]
+    out_h, out_w = (H + sy - 1) // sy, (W + sx - 1) // sx
+    in_channels = image.shape[2] if image.ndim == 3 else 1
+    rows = _band_rows(W, in_channels, sy)
+    out = create_output((out_h, out_w) if image.ndim == 2 else (out_h, out_w, in_channels), np.float32)
+
+    band_stats: dict[str, Any] = {}
+
+    def process(band: np.ndarray) -> np.ndarray:
+        return morphology(band, kernel, operation=operation, stride=stride, pad_mode=pad_mode, engine_stats=band_stats, cancel_token=cancel_token)
+
+    halo = kH // 2 if operation == "morph_gradient" else 2 * (kH // 2)
+    n_bands = _run_bands(image, out, halo, sy, rows, process, cancel_token)
+    out.flush()
+    log.log.write(text=f"{Info.STREAMED_CONVOLUTION.value} (bands={n_bands}, rows={rows}, file={out.filename})", tag="INFO", modulename=Path(__file__).stem)
+    if engine_stats is not None:
+        engine_stats.update(band_stats)
+        engine_stats["streamed"] = {"bands": n_bands, "band_rows": rows, "band_bytes": BAND_BYTES}
+    return out
@@ -0,0 +1,174 @@
+import math
+from functools import lru_cache
+from pathlib import Path
+from typing import Tuple
+from typing_extensions import TypedDict
+import src.gui.utils.logger as log
+from src.gui.state.error import Info
+
+
+CPU_CACHE_PATH: str = "/sys/devices/system/cpu/cpu0/cache"
+DEFAULT_L2_BYTES: int = 1 << 20
+DEFAULT_L3_BYTES: int = 8 << 20
+CACHE_FRACTION: float = 0.5
+MIN_TILE: int = 32
+MAX_TILE: int = 4096
+TASKS_PER_WORKER: int = 4
+LOG_PLANS: bool = True
+
+
+class Tile_Plan(TypedDict):
+    engine: str
+    tile_h: int
+    tile_w: int
+    n_tiles: int
+    working_set: int
+    cache_level: int
+    cache_bytes: int
+    workers: int
+    channel_tasks: bool
+
+
+def _parse_size(text: str) -> int:
+    text = text.strip().upper()
+    units = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30}
+    if text and text[-1] in units:
+        return int(text[:-1]) * units[text[-1]]
+    return int(text)
+
+
+def _shared_cpus(text: str) -> int:
+    count = 0
+    for part in text.strip().split(","):
+        if "-" in part:
+            a, b = part.split("-")
+            count += int(b) - int(a) + 1
+        elif part:
+            count += 1
+    return max(1, count)
+
+
+@lru_cache(maxsize=1)
+def cache_sizes() -> dict[int, int]:
+    sizes = {2: DEFAULT_L2_BYTES, 3: DEFAULT_L3_BYTES}
+    base = Path(CPU_CACHE_PATH)
+    if not base.is_dir():
+        return sizes
+    for index in sorted(base.glob("index*")):
+        try:
+            level = int((index / "level").read_text())
+            kind = (index / "type").read_text().strip()
+            size = _parse_size((index / "size").read_text())
+            shared_file = index / "shared_cpu_list"
+            shared = _shared_cpus(shared_file.read_text()) if shared_file.exists() else 1
+        except (OSError, ValueError):
+            continue
+        if level in (2, 3) and kind in ("Unified", "Data"):
+            sizes[level] = max(size // shared, 1 << 16) if level == 3 else size
+    return sizes
+
+
+def _working_set(tile_h: int, tile_w: int, stride: Tuple[int, int], k_shape: Tuple[int, int], in_bytes: int, work_bytes: int) -> int:
+    sy, sx = stride
+    kH, kW = k_shape
+    slab = ((tile_h - 1) * sy + kH) * ((tile_w - 1) * sx + kW)
+    return slab * in_bytes + tile_h * tile_w * work_bytes
+
+
+def plan_tiles(
+    engine: str,
+    out_hw: Tuple[int, int],
+    stride: Tuple[int, int],
+    k_shape: Tuple[int, int],
+    workers: int,
+    in_bytes: int = 4,
+    work_bytes: int = 12,
+    cache_level: int = 2
+) -> Tile_Plan:
+    out_h, out_w = max(1, out_hw[0]), max(1, out_hw[1])
+    cache_bytes = cache_sizes()[cache_level]
+    budget = int(cache_bytes * CACHE_FRACTION)
+
+    sy, sx = stride
+    per_px = in_bytes * sy * sx + work_bytes
+    side = int(math.sqrt(max(budget, 1) / per_px))
+    side = max(MIN_TILE, min(MAX_TILE, side))
+    tile_w = min(out_w, side)
+    tile_h = min(out_h, max(MIN_TILE, side * side // tile_w))
+    tile_h = min(tile_h, MAX_TILE)
+    while tile_h > MIN_TILE and _working_set(tile_h, tile_w, stride, k_shape, in_bytes, work_bytes) > budget:
+        tile_h = max(MIN_TILE, tile_h * 3 // 4)
+
+    target = max(1, workers) * TASKS_PER_WORKER if workers > 1 else 1
+    while math.ceil(out_h / tile_h) * math.ceil(out_w / tile_w) < target:
+        if tile_h >= tile_w and tile_h > MIN_TILE:
+            tile_h = max(MIN_TILE, (tile_h + 1) // 2)
+        elif tile_w > MIN_TILE:
+            tile_w = max(MIN_TILE, (tile_w + 1) // 2)
+        else:
+            break
+
+    plan: Tile_Plan = {
+        "engine": engine,
+        "tile_h": tile_h,
+        "tile_w": tile_w,
+        "n_tiles": math.ceil(out_h / tile_h) * math.ceil(out_w / tile_w),
+        "working_set": _working_set(tile_h, tile_w, stride, k_shape, in_bytes, work_bytes),
+        "cache_level": cache_level,
+        "cache_bytes": cache_bytes,
+        "workers": workers,
+        "channel_tasks": False
+    }
+    return plan
+
+
+def report(plan: Tile_Plan) -> None:
+    if LOG_PLANS:
+        log.log.write(text=f"{Info.TILE_PLAN.value} {plan}", tag="INFO", modulename=Path(__file__).stem)
+
+
+def fixed_plan(engine: str, out_hw: Tuple[int, int], tile: int, workers: int) -> Tile_Plan:
+    out_h, out_w = max(1, out_hw[0]), max(1, out_hw[1])
+    return {
+        "engine": engine,
+        "tile_h": min(tile, out_h),
+        "tile_w": min(tile, out_w),
+        "n_tiles": math.ceil(out_h / tile) * math.ceil(out_w / tile),
+        "working_set": 0,
+        "cache_level": 0,
+        "cache_bytes": 0,
+        "workers": workers,
+        "channel_tasks": False
+    }
+
+
+def cap_tile(plan: Tile_Plan, out_hw: Tuple[int, int], max_pixels: int) -> Tile_Plan:
+    out_h, out_w = max(1, out_hw[0]), max(1, out_hw[1])
+    max_pixels = max(1, max_pixels)
+    while plan["tile_h"] * plan["tile_w"] > max_pixels:
+        if plan["tile_h"] >= plan["tile_w"]:
+            plan["tile_h"] = (plan["tile_h"] + 1) // 2
+        else:
+            plan["tile_w"] = (plan["tile_w"] + 1) // 2
+    plan["n_tiles"] = math.ceil(out_h / plan["tile_h"]) * math.ceil(out_w / plan["tile_w"])
+    return plan
+
+
+def plan_channels(plan: Tile_Plan, channels: int) -> Tile_Plan:
+    if channels > 1 and plan["n_tiles"] < plan["workers"]:
+        plan["channel_tasks"] = True
+        plan["n_tiles"] *= channels
+    return plan
+
+
+def split(out_hw: Tuple[int, int], plan: Tile_Plan, channels: int = 1) -> list[Tuple[int, ...]]:
+    out_h, out_w = out_hw
+    tiles: list[Tuple[int, ...]] = []
+    for i0 in range(0, out_h, plan["tile_h"]):
+        for j0 in range(0, out_w, plan["tile_w"]):
+            tile = (i0, min(i0 + plan["tile_h"], out_h), j0, min(j0 + plan["tile_w"], out_w))
+            if plan["channel_tasks"] and channels > 1:
+                tiles.extend(tile + (c, c + 1) for c in range(channels))
+            else:
+                tiles.append(tile)
+    return tiles
@@ -0,0 +1,109 @@
+import time
+import numpy
+import numpy.typing as npt
+from src.gui.state.project_file_type import Action_Type, Filter_Type
+from src.processing.basic_stats_type import Basic_Stats
+from src.processing.convolution.default import default, _is_multichannel_gray
+
+
+FUSE_LINEAR_FILTERS: bool = True
+LINEAR_FILTER_TYPES: tuple[str, ...] = ("smoothing",)
+
+
+def linear_kernel(filter_data: Filter_Type) -> list[list[float]]:
+    if filter_data["settings"]["type"] == "smoothing":
+        return [[y["value"] * filter_data["settings"]["factor"] for y in x] for x in filter_data["grid"]]
+    return [[y["value"] for y in x] for x in filter_data["grid"]]
+
+
+def _linear_filter(action: Action_Type) -> Filter_Type | None:
+    data = action["data"]
+    if action["type"] != "filter" or isinstance(data, str):
+        return None
+    if data["settings"]["type"] not in LINEAR_FILTER_TYPES:
+        return None
+    if tuple(data["settings"]["spatial_sampling_rate"]) != (1, 1):
+        return None
+    return data
+
+
+def _is_gray(image: numpy.ndarray) -> bool:
+    return image.ndim == 2 or image.shape[2] in (1, 2) or _is_multichannel_gray(image)
+
+
+def _halo(kernels: list[numpy.ndarray]) -> tuple[int, int, int, int]:
+    margin_y = sum(k.shape[0] // 2 for k in kernels[1:])
+    margin_x = sum(k.shape[1] // 2 for k in kernels[1:])
+    total_y = sum(k.shape[0] // 2 for k in kernels)
+    total_x = sum(k.shape[1] // 2 for k in kernels)
+    return margin_y, margin_x, margin_y + total_y, margin_x + total_x
+
+
+def fusible_run_length(image: numpy.ndarray, actions: list[Action_Type]) -> int:
+    if not FUSE_LINEAR_FILTERS or _is_gray(image) or image.shape[2] != 3:
+        return 1
+    kernels: list[numpy.ndarray] = []
+    for action in actions:
+        data = _linear_filter(action)
+        if data is None:
+            break
+        kernels.append(numpy.asarray(linear_kernel(data), dtype=numpy.float64))
+    if len(kernels) < 2:
+        return 1
+    _, _, strip_y, strip_x = _halo(kernels)
+    if image.shape[0] <= 2 * strip_y or image.shape[1] <= 2 * strip_x:
+        return 1
+    return len(kernels)
+
+
+def compose_kernels(kernels: list[numpy.ndarray]) -> numpy.ndarray:
+    composed = numpy.asarray(kernels[0], dtype=numpy.float64)
+    for k in kernels[1:]:
+        kH, kW = k.shape
+        out = numpy.zeros((composed.shape[0] + kH - 1, composed.shape[1] + kW - 1), dtype=numpy.float64)
+        for dy in range(kH):
+            for dx in range(kW):
+                if k[dy, dx] != 0.0:
+                    out[dy:dy + composed.shape[0], dx:dx + composed.shape[1]] += k[dy, dx] * composed
+        composed = out
+    return composed
+
+
+def _apply_sequential(image: numpy.ndarray, filters: list[Filter_Type]) -> npt.NDArray:
+    for data in filters:
+        image = default(image, linear_kernel(data))  # type: ignore
+    return image
+
+
+def apply_fused(image: numpy.ndarray, actions: list[Action_Type], cancel_token: int | None = None) -> tuple[npt.NDArray[numpy.uint8 | numpy.float32], list[Basic_Stats]]:
+    start_time = time.time()
+    filters = [_linear_filter(a) for a in actions]
+    assert all(f is not None for f in filters)
+    filters_ = [f for f in filters if f is not None]
+    kernels = [numpy.asarray(linear_kernel(f), dtype=numpy.float64) for f in filters_]
+    composed = compose_kernels(kernels)
+    engine_stats: dict = {}
+    result = default(image, composed.tolist(), engine_stats=engine_stats, cancel_token=cancel_token)
+
+    margin_y, margin_x, strip_y, strip_x = _halo(kernels)
+    H, W = image.shape[:2]
+    if margin_y > 0:
+        result[:margin_y] = _apply_sequential(image[:strip_y], filters_)[:margin_y]
+        result[H - margin_y:] = _apply_sequential(image[H - strip_y:], filters_)[strip_y - margin_y:]
+    if margin_x > 0:
+        result[:, :margin_x] = _apply_sequential(image[:, :strip_x], filters_)[:, :margin_x]
+        result[:, W - margin_x:] = _apply_sequential(image[:, W - strip_x:], filters_)[:, strip_x - margin_x:]
+
+    engine_stats["fused_steps"] = len(actions)
+    engine_stats["fused_kernel_size"] = list(composed.shape)
+    elapsed = time.time() - start_time
+    stats: list[Basic_Stats] = []
+    for index, action in enumerate(actions):
+        last = index == len(actions) - 1
+        stats.append({
+            "time": elapsed if last else 0.0,
+            "action": action,
+            "extended_stats": None,
+            "engine_stats": engine_stats if last else {"fused_into": len(actions) - 1 - index},
+        })
+    return result, stats
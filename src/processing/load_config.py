@@ -16,7 +16,7 @@ def load() -> Config_Processing_Type:
         with open(f"./src/assets/action/config/feature/{key}.json", "r", encoding="utf-8") as f:
             data["feature"][key] = json.load(f)
 
-    modules_pipeline = ["canny"]
+    modules_pipeline = ["canny", "compass", "gradient"]
     for key in modules_pipeline:
         with open(f"./src/assets/action/config/pipeline/{key}.json", "r", encoding="utf-8") as f:
             data["pipeline"][key] = json.load(f)
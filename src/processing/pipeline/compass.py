@@ -0,0 +1,22 @@
+import numpy as np
+from numpy.typing import NDArray
+import cv2
+from src.processing.root_config import processing_config
+from src.processing.convolution.filter_bank import filter_bank, compass_kernels
+
+
+def compass(
+    image: NDArray[np.uint8 | np.float32],
+    operator: str
+) -> tuple[NDArray[np.uint8], NDArray[np.float32]]:
+    config = processing_config["pipeline"]["compass"]
+    assert config is not None
+    directions = config["directions"]
+    kernels = compass_kernels(config[operator], directions)  # type: ignore
+
+    magnitude, index = filter_bank(image, kernels, reduce=True)
+    assert index is not None
+
+    orientation = index.astype(np.float32) * np.float32(360.0 / directions)
+
+    return cv2.convertScaleAbs(magnitude), orientation
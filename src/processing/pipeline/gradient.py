@@ -0,0 +1,18 @@
+from typing import Any
+import numpy as np
+from numpy.typing import NDArray
+from src.processing.root_config import processing_config
+import src.processing.convolution.gradient as gradient_engine
+
+
+def gradient(
+    image: NDArray[np.uint8 | np.float32],
+    operator: str,
+    nms: bool = False,
+    engine_stats: dict[str, Any] | None = None
+) -> tuple[NDArray[np.float32], NDArray[np.float32] | None]:
+    config = processing_config["pipeline"]["gradient"]
+    assert config is not None
+    kernel_x = config[operator]  # type: ignore
+
+    return gradient_engine.gradient(image, kernel_x, with_orientation=config["orientation"], nms=nms, engine_stats=engine_stats)
@@ -38,7 +38,8 @@ def quick_test(image_before: np.ndarray, temp_images: list[np.ndarray], stats_li
             "type": "all",
             "data": "-"
         },
-        "extended_stats": basic_result
+        "extended_stats": basic_result,
+        "engine_stats": None
     }
 
     summary = {
@@ -0,0 +1,7 @@
+from typing_extensions import TypedDict
+
+
+class Compass_Type(TypedDict):
+    directions: int
+    kirsch: list[list[float]]
+    prewitt: list[list[float]]
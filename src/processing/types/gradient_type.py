@@ -0,0 +1,8 @@
+from typing_extensions import TypedDict
+
+
+class Gradient_Type(TypedDict):
+    orientation: bool
+    sobel: list[list[float]]
+    scharr: list[list[float]]
+    prewitt: list[list[float]]
@@ -0,0 +1,40 @@
+import os
+import json
+from pathlib import Path
+import pytest
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+os.chdir(ROOT_DIR)
+
+import src.gui.state.root as root  # noqa: E402
+import src.gui.utils.logger as log  # noqa: E402
+import src.processing.convolution.execution as execution  # noqa: E402
+import src.processing.convolution.tiling as tiling  # noqa: E402
+
+
+class _Var:
+    def __init__(self, value=None):
+        self._value = value
+
+    def get(self):
+        return self._value
+
+    def set(self, value):
+        self._value = value
+
+
+@pytest.fixture(autouse=True, scope="session")
+def gui_state(tmp_path_factory):
+    log.log._path = str(tmp_path_factory.mktemp("log"))
+    log.log._print_console = False
+    with open(ROOT_DIR / "src/assets/lang/en.json", encoding="utf-8") as f:
+        root.current_lang.data = {key: _Var(value) for key, value in json.load(f).items()}
+    root.status = _Var("")
+    root.status_details = _Var("")
+    tiling.LOG_PLANS = False
+
+
+@pytest.fixture(params=["inline", "thread", "process"])
+def execution_mode(request, monkeypatch):
+    monkeypatch.setattr(execution, "FORCE_MODE", request.param)
+    return request.param
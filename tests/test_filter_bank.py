@@ -0,0 +1,27 @@
+import numpy as np
+from src.processing.convolution.filter_bank import filter_bank, compass_kernels
+from src.processing.root_config import processing_config
+
+
+def _disk(size: int = 64, radius: int = 20) -> np.ndarray:
+    yy, xx = np.mgrid[:size, :size]
+    return np.where((yy - size // 2) ** 2 + (xx - size // 2) ** 2 <= radius ** 2, 200, 20).astype(np.uint8)
+
+
+def test_compass_reaches_every_direction():
+    config = processing_config["pipeline"]["compass"]
+    for operator in ("prewitt", "kirsch"):
+        kernels = compass_kernels(config[operator], config["directions"])
+        _, index = filter_bank(_disk(), kernels, reduce=True)
+        assert index is not None
+        assert set(np.unique(index).tolist()) == set(range(config["directions"]))
+
+
+def test_reduce_takes_signed_maximum(execution_mode):
+    image = np.random.default_rng(0).random((40, 50)).astype(np.float32) * 255
+    kernels = compass_kernels(processing_config["pipeline"]["compass"]["prewitt"], 8)
+    responses, _ = filter_bank(image, kernels, reduce=False)
+    magnitude, index = filter_bank(image, kernels, reduce=True)
+    assert index is not None
+    np.testing.assert_array_equal(index, np.argmax(responses, axis=0))
+    np.testing.assert_array_equal(magnitude, responses.max(axis=0))
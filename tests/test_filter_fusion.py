@@ -0,0 +1,38 @@
+import json
+import numpy as np
+from src.processing.convolution.default import default
+from src.processing.filter_fusion import apply_fused, fusible_run_length, linear_kernel
+
+
+def _filters(*names: str) -> list:
+    with open("./src/assets/action/default_filter.json", "r", encoding="utf-8") as f:
+        filters = json.load(f)
+    by_name = {(v["data"]["name"], v["data"]["settings"]["size"][0]): v for v in filters.values()}
+    return [by_name[name] for name in names]
+
+
+def _sequential(image: np.ndarray, actions: list) -> np.ndarray:
+    for action in actions:
+        image = default(image, linear_kernel(action["data"]), edge_filter=action["data"]["settings"]["type"] == "edge_detection")
+    return image
+
+
+def test_colour_run_matches_sequential():
+    image = (np.random.default_rng(0).random((60, 80, 3)) * 255).astype(np.uint8)
+    actions = _filters(("Gauss_s085", 3), ("Mean", 3), ("Mean", 5))
+    assert fusible_run_length(image, actions) == 3
+    fused, stats = apply_fused(image, actions)
+    np.testing.assert_allclose(fused, _sequential(image, actions), atol=1e-3)
+    assert [s["engine_stats"].get("fused_into") for s in stats] == [2, 1, None]
+
+
+def test_grey_runs_are_not_fused():
+    image = (np.random.default_rng(1).random((60, 80)) * 255).astype(np.uint8)
+    assert fusible_run_length(image, _filters(("Gauss_s085", 3), ("Mean", 3))) == 1
+    assert fusible_run_length(np.dstack([image] * 3), _filters(("Mean", 3), ("Mean", 3))) == 1
+
+
+def test_edge_detection_ends_the_run():
+    image = (np.random.default_rng(2).random((60, 80, 3)) * 255).astype(np.uint8)
+    assert fusible_run_length(image, _filters(("Gauss_s085", 3), ("Laplace_8", 3))) == 1
+    assert fusible_run_length(image, _filters(("Mean", 3), ("Mean", 3), ("Laplace_8", 3))) == 2
@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+from src.processing.convolution.morphology import morphology
+from src.processing.convolution.ranking import ranking
+
+N = None
+ASYMMETRIC = {
+    "corner": [[1, 1, N], [N, N, N], [N, N, N]],
+    "hook": [[1] * 9] * 4 + [[1] + [N] * 8] * 5,
+}
+SYMMETRIC = {
+    "square": [[1] * 3] * 3,
+    "disk": [[N, 1, 1, 1, N], [1, 1, 1, 1, 1], [1, 1, 1, 1, 1], [1, 1, 1, 1, 1], [N, 1, 1, 1, N]],
+    "large": [[1] * 9] * 9,
+}
+
+
+def _image(shape, dtype):
+    return (np.random.default_rng(len(shape)).random(shape) * 255).astype(dtype)
+
+
+def _reflect(kernel):
+    return [row[::-1] for row in kernel[::-1]]
+
+
+@pytest.mark.parametrize("name", sorted(ASYMMETRIC))
+@pytest.mark.parametrize("dtype", [np.uint8, np.float32])
+@pytest.mark.parametrize("shape", [(47, 61), (38, 45, 3)])
+@pytest.mark.parametrize("pad_mode", ["reflect", "edge", "constant"])
+def test_opening_and_closing_bracket_the_image(execution_mode, name, dtype, shape, pad_mode):
+    image = _image(shape, dtype)
+    kernel = ASYMMETRIC[name]
+    opened = morphology(image, kernel, operation="opening", pad_mode=pad_mode, tile=16)
+    closed = morphology(image, kernel, operation="closing", pad_mode=pad_mode, tile=16)
+    top_hat = morphology(image, kernel, operation="top_hat", pad_mode=pad_mode, tile=16)
+    assert np.all(opened <= image)
+    assert np.all(closed >= image)
+    assert np.all(top_hat >= 0)
+    np.testing.assert_array_equal(top_hat, image.astype(np.float32) - opened)
+
+
+@pytest.mark.parametrize("name", sorted(ASYMMETRIC))
+@pytest.mark.parametrize("operation", ["opening", "closing"])
+def test_second_pass_uses_reflected_element(name, operation):
+    image = _image((47, 61), np.uint8)
+    kernel = ASYMMETRIC[name]
+    first, second = ("minimum", "maximum") if operation == "opening" else ("maximum", "minimum")
+    expected = ranking(ranking(image, kernel, mode=first, pad_mode="valid"), _reflect(kernel), mode=second, pad_mode="valid")
+    got = morphology(image, kernel, operation=operation, pad_mode="valid")
+    np.testing.assert_array_equal(got, expected)
+
+
+@pytest.mark.parametrize("name", sorted(SYMMETRIC))
+@pytest.mark.parametrize("dtype", [np.uint8, np.float32])
+@pytest.mark.parametrize("shape", [(47, 61), (38, 45, 3)])
+@pytest.mark.parametrize("operation", ["opening", "closing"])
+def test_symmetric_element_matches_chained_ranking(execution_mode, name, dtype, shape, operation):
+    image = _image(shape, dtype)
+    kernel = SYMMETRIC[name]
+    first, second = ("minimum", "maximum") if operation == "opening" else ("maximum", "minimum")
+    expected = ranking(ranking(image, kernel, mode=first), kernel, mode=second)
+    got = morphology(image, kernel, operation=operation, tile=16)
+    r = len(kernel) - 1
+    np.testing.assert_array_equal(got[r:-r, r:-r], expected[r:-r, r:-r])
+    valid = morphology(image, kernel, operation=operation, pad_mode="valid", tile=16)
+    np.testing.assert_array_equal(valid, ranking(ranking(image, kernel, mode=first, pad_mode="valid"), kernel, mode=second, pad_mode="valid"))
+
+
+@pytest.mark.parametrize("name", sorted(SYMMETRIC) + sorted(ASYMMETRIC))
+@pytest.mark.parametrize("stride", [(1, 1), (2, 3)])
+def test_gradient_is_maximum_minus_minimum(execution_mode, name, stride):
+    image = _image((38, 45, 3), np.float32)
+    kernel = {**SYMMETRIC, **ASYMMETRIC}[name]
+    expected = ranking(image, kernel, mode="maximum", stride=stride) - ranking(image, kernel, mode="minimum", stride=stride)
+    got = morphology(image, kernel, operation="morph_gradient", stride=stride, tile=16)
+    np.testing.assert_array_equal(got, expected)
@@ -0,0 +1,43 @@
+import itertools
+import numpy as np
+import pytest
+import src.processing.convolution.ranking as ranking_module
+import src.processing.convolution.sorting_network as sorting_network
+from src.processing.convolution.ranking import ranking
+
+
+@pytest.mark.parametrize("n", [9, 25])
+def test_selection_networks_pick_every_rank(n):
+    rng = np.random.default_rng(n)
+    if n == 9:
+        values = np.array(list(itertools.product((0, 1), repeat=9)), dtype=np.uint8).T.copy()
+    else:
+        values = rng.integers(0, 256, (n, 20000)).astype(np.uint8)
+    expected = np.sort(values, axis=0)
+    for rank in range(n):
+        network, target = sorting_network.selection(n, rank)
+        got = sorting_network.select([v.copy() for v in values], network, target)
+        np.testing.assert_array_equal(got, expected[rank])
+
+
+def test_median_9_uses_19_exchanges():
+    network, _ = sorting_network.selection(9, 4)
+    assert len(network) == 19
+
+
+@pytest.mark.parametrize("size", [3, 5])
+@pytest.mark.parametrize("dtype", [np.uint8, np.float32])
+@pytest.mark.parametrize("shape", [(47, 61), (38, 45, 3)])
+@pytest.mark.parametrize("stride", [(1, 1), (2, 3)])
+@pytest.mark.parametrize("pad_mode", ["reflect", "constant"])
+def test_network_median_matches_partition(monkeypatch, size, dtype, shape, stride, pad_mode):
+    image = (np.random.default_rng(size).random(shape) * 255).astype(dtype)
+    kernel = [[1] * size] * size
+    stats: dict = {}
+    network = ranking(image, kernel, stride=stride, pad_mode=pad_mode, engine_stats=stats)
+    assert stats["backend"] == "ranking/network"
+    monkeypatch.setattr(ranking_module, "SORTING_NETWORK_SHAPES", ())
+    generic = ranking(image, kernel, stride=stride, pad_mode=pad_mode, engine_stats=stats)
+    assert stats["backend"] == "ranking"
+    assert network.dtype == generic.dtype
+    np.testing.assert_array_equal(network, generic)